@@ -0,0 +1,256 @@
+"""
+Benchmarks for evaluation, fitness and full runs
+
+Every benchmark uses fixed seeds and the polynomial from examples/learn_poly.py as training data.
+The results are printed as a table and can be written as JSON to track performance over commits:
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --quick
+    python benchmarks/run.py --suite fitness --rows 50 10000 --populations 500
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+from typing import Callable, Optional
+import numpy as np
+
+from LGP.LGP import LGP
+from LGP.compiler import compile
+from LGP.evaluation import Operators, evaluate, evaluate_vectorized, vectorize_operators
+from LGP.fitness import FitnessBase, MimicTrainingData, MimicTrainingDataBatched, MimicTrainingDataMultiProcessing, MimicTrainingDataThreaded
+from LGP.selection import TournamentSelection
+from LGP.crossover import TwoPointCrossover
+from LGP.mutation import InstructionMutation, InsertMutation, DeleteMutation
+from LGP.population import random_individual, random_population
+
+
+NVAR = 4
+CONST_REG = [1.0, 2.0, 3.0]
+NCONST = len(CONST_REG)
+OPS = [
+    Operators.Add,
+    Operators.Sub,
+    Operators.Mult,
+]
+NOPS = len(OPS)
+
+SUITES = ("evaluate", "fitness", "run")
+
+
+def seed(value: int) -> None:
+    random.seed(value)
+    np.random.seed(value)
+
+
+def training_data(rows: int) -> tuple[np.ndarray, np.ndarray]:
+    p = [1, 4, -10, -7]
+    x = np.linspace(-5, 5, rows).reshape((-1, 1))
+    y = np.polyval(p, x)
+    return x, y
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """
+    Return the shortest wall time of repeat calls to func
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_evaluate(args: argparse.Namespace) -> list[dict]:
+    """
+    Instructions per second for scalar, compiled and vectorized evaluation of a single chromosome
+    """
+    results = []
+    vectorized_operators = vectorize_operators(OPS)
+    for length in args.lengths:
+        seed(args.seed)
+        chromosome = random_individual(length, NVAR, NCONST, NOPS)
+        for rows in args.rows:
+            x, _ = training_data(rows)
+
+            # The scalar variants are timed on a limited number of rows
+            scalar_rows = min(rows, args.max_scalar_rows)
+            registers = [[float(xp[0])] + [0.0] * (NVAR - 1) for xp in x[:scalar_rows]]
+            program = compile(chromosome, OPS, NVAR, CONST_REG)
+
+            varReg = np.zeros((NVAR, rows))
+            varReg[0] = x[:, 0]
+
+            variants = {
+                "scalar": (scalar_rows, lambda: [evaluate(chromosome, OPS, list(r), CONST_REG) for r in registers]),
+                "compiled": (scalar_rows, lambda: [program(list(r)) for r in registers]),
+                "vectorized": (rows, lambda: evaluate_vectorized(chromosome, vectorized_operators, varReg, CONST_REG)),
+            }
+            for variant, (evaluated_rows, func) in variants.items():
+                seconds = best_time(func, args.repeat)
+                results.append({
+                    "benchmark": "evaluate",
+                    "variant": variant,
+                    "rows": rows,
+                    "length": length,
+                    "seconds": seconds,
+                    "metric": "instructions/s",
+                    "value": length * evaluated_rows / seconds,
+                })
+    return results
+
+
+def fitness_variants(x: np.ndarray, y: np.ndarray, args: argparse.Namespace) -> dict[str, FitnessBase]:
+    variants = {
+        "vectorized": MimicTrainingData(x, y, NVAR, CONST_REG, OPS, vectorized=True),
+        "batched": MimicTrainingDataBatched(x, y, NVAR, CONST_REG, OPS),
+        "multiprocessing": MimicTrainingDataMultiProcessing(x, y, NVAR, CONST_REG, OPS, workers=args.workers, vectorized=True),
+        "threaded": MimicTrainingDataThreaded(x, y, NVAR, CONST_REG, OPS, workers=args.workers),
+    }
+    if len(x) <= args.max_scalar_rows:
+        variants["scalar"] = MimicTrainingData(x, y, NVAR, CONST_REG, OPS)
+    return variants
+
+
+def bench_fitness(args: argparse.Namespace) -> list[dict]:
+    """
+    Individuals per second for the fitness functions, serial and with multiprocessing
+    """
+    results = []
+    for rows in args.rows:
+        x, y = training_data(rows)
+        for population_size in args.populations:
+            seed(args.seed)
+            population = random_population(population_size, args.min_length, args.max_length, NVAR, NCONST, NOPS)
+            for variant, fitness_func in fitness_variants(x, y, args).items():
+                with fitness_func:
+                    # Warm up, e.g. start worker processes
+                    fitness_func(population[:1])
+                    seconds = best_time(lambda: fitness_func(population), args.repeat)
+                results.append({
+                    "benchmark": "fitness",
+                    "variant": variant,
+                    "rows": rows,
+                    "population": population_size,
+                    "seconds": seconds,
+                    "metric": "individuals/s",
+                    "value": population_size / seconds,
+                })
+    return results
+
+
+def bench_run(args: argparse.Namespace) -> list[dict]:
+    """
+    Generations per second for a full LGP run
+    """
+    results = []
+    for rows in args.rows:
+        x, y = training_data(rows)
+        for population_size in args.populations:
+            for variant, fitness_func in fitness_variants(x, y, args).items():
+                seed(args.seed)
+                lgp = LGP(
+                    population=random_population(population_size, args.min_length, args.max_length, NVAR, NCONST, NOPS),
+                    selection_method=TournamentSelection(pTour=0.8, size=4),
+                    crossover_method=TwoPointCrossover(pCross=0.6, max_length=2 * args.max_length),
+                    mutation_method=[
+                        InstructionMutation(pMutate=0.7, nVar=NVAR, nConst=NCONST, nOp=NOPS),
+                        InsertMutation(pInsert=0.05, nVar=NVAR, nConst=NCONST, nOp=NOPS),
+                        DeleteMutation(pDelete=0.05, nVar=NVAR, nConst=NCONST, nOp=NOPS),
+                    ],
+                    fitness_func=fitness_func,
+                    minimize=True,
+                    elitism=True,
+                    len_punishment=0.01,
+                )
+                with fitness_func:
+                    start = time.perf_counter()
+                    lgp.run(args.generations, progress=False)
+                    seconds = time.perf_counter() - start
+                results.append({
+                    "benchmark": "run",
+                    "variant": variant,
+                    "rows": rows,
+                    "population": population_size,
+                    "generations": args.generations,
+                    "seconds": seconds,
+                    "metric": "generations/s",
+                    "value": args.generations / seconds,
+                })
+    return results
+
+
+BENCHMARKS = {
+    "evaluate": bench_evaluate,
+    "fitness": bench_fitness,
+    "run": bench_run,
+}
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmarks for LGP")
+    parser.add_argument("--suite", nargs="+", choices=SUITES, default=list(SUITES), help="The benchmarks to run")
+    parser.add_argument("--rows", nargs="+", type=int, default=[50, 10_000, 1_000_000], help="The number of training samples")
+    parser.add_argument("--lengths", nargs="+", type=int, default=[10, 100], help="Chromosome lengths for the evaluate benchmark")
+    parser.add_argument("--populations", nargs="+", type=int, default=[100, 500], help="Population sizes")
+    parser.add_argument("--min-length", type=int, default=10, help="The minimum length of random chromosomes")
+    parser.add_argument("--max-length", type=int, default=100, help="The maximum length of random chromosomes")
+    parser.add_argument("--generations", type=int, default=5, help="The number of generations in the run benchmark")
+    parser.add_argument("--workers", type=int, default=4, help="The number of worker processes for multiprocessing")
+    parser.add_argument("--max-scalar-rows", type=int, default=10_000, help="Skip or limit scalar evaluation above this number of rows")
+    parser.add_argument("--repeat", type=int, default=3, help="Report the best of this many repetitions")
+    parser.add_argument("--seed", type=int, default=0, help="The random seed")
+    parser.add_argument("--quick", action="store_true", help="Small sizes, for a quick check")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.rows = [50, 1_000]
+        args.lengths = [10, 100]
+        args.populations = [50]
+        args.generations = 2
+        args.repeat = 1
+        args.workers = 2
+    return args
+
+
+def main(argv: Optional[list[str]] = None) -> list[dict]:
+    args = parse_args(argv)
+
+    results = []
+    for suite in args.suite:
+        for result in BENCHMARKS[suite](args):
+            print(
+                f"{result['benchmark']:<9} {result['variant']:<16} rows={result['rows']:<8} "
+                f"{'length=' + str(result['length']) if 'length' in result else 'population=' + str(result['population']):<15} "
+                f"{result['value']:>14,.1f} {result['metric']}"
+            )
+            results.append(result)
+
+    if args.output is not None:
+        report = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "arguments": vars(args),
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
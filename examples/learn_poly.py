@@ -6,7 +6,8 @@ from LGP.fitness import MimicTrainingData
 from LGP.selection import TournamentSelection
 from LGP.crossover import TwoPointCrossover
 from LGP.mutation import InstructionMutation, InsertMutation, DeleteMutation, linear_decay
-from LGP.evaluation import Operators, evaluate
+from LGP.evaluation import Operators
+from LGP.compiler import compile
 from LGP.population import random_population
 from LGP._typing import Chromosome
 
@@ -79,10 +80,11 @@ def main():
 
     # Update function for the plot
     def update(chromosome: Chromosome):
+        program = compile(chromosome, OPS, NVAR, CONST_REG)
         y = []
         for xp in x:
             varReg = [float(xp[0])] + [0] * (NVAR - 1)
-            out = evaluate(chromosome, OPS, varReg, CONST_REG)
+            out = program(varReg)
             y.append(out[0])
         best_line.set_ydata(y)
         fig.canvas.draw()
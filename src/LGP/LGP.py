@@ -3,12 +3,15 @@ import numpy as np
 from typing import Optional, Callable
 import operator
 import json
+import time
 
 from ._typing import Chromosome
 from LGP.selection import SelectionBase
 from LGP.crossover import CrossoverBase
 from LGP.mutation import MutationBase
 from LGP.fitness import FitnessBase
+from LGP import checkpoint
+from LGP.profiling import NullProfiler, Profiler, GenerationRecord
 
 
 class LGP:
@@ -57,6 +60,20 @@ class LGP:
         self.avg_fitness_log = []
         self.best_fitness_log = []
 
+        # The last evaluated population and its fitness
+        self.last_population: list[Chromosome] = []
+        self.last_fitness: list[float] = []
+
+        self.generation = 0
+
+        # Checkpoints
+        self.checkpoint_filename: Optional[str] = None
+        self.checkpoint_generations: Optional[int] = None
+        self.checkpoint_seconds: Optional[float] = None
+        self._last_checkpoint = time.monotonic()
+
+        self.profiler = NullProfiler()
+
         # Callbacks
         self.new_best_callback: list[Callable[[Chromosome], None]] = []
         self.generation_callback: list[Callable[[LGP], None]] = []
@@ -80,6 +97,10 @@ class LGP:
         self.best_fitness = fitness[best_fitness_index]
         self.best_individual = self.population[best_fitness_index]
 
+        # The fitness is only an estimate. Score the candidate exactly before it can become the new best
+        if not self.fitness_func.exact:
+            self.best_fitness = self.fitness_func.exact_fitness(self.best_individual)
+
         # Update the all time best individual
         if self.all_time_best_fitness is None or fitness_comparison(self.best_fitness, self.all_time_best_fitness):
             self.all_time_best_fitness = self.best_fitness
@@ -105,17 +126,124 @@ class LGP:
         save_dict = {
             "best-fitness": self.best_fitness_log,
             "avg-fitness": self.avg_fitness_log,
-            "chromosome": self.best_individual,
+            "chromosome": [list(instruction) for instruction in self.best_individual],
         }
         with open(filename, 'w') as f:
             json.dump(save_dict, f)
 
-    def run(self, generations: int) -> Chromosome:
-        pbar = trange(generations, desc="Best fitness: ???")
+    def enable_profiling(self, callback: Optional[Callable[[GenerationRecord], None]] = None) -> Profiler:
+        """
+        Record the time spent in each phase of every generation, see Profiler
+
+        Parameters:
+        - callback:     Called with the record of every generation
+
+        Returns:
+        - profiler:     The profiler. The records are in profiler.records
+        """
+        self.profiler = Profiler(callback)
+        return self.profiler
+
+    def disable_profiling(self) -> None:
+        self.profiler = NullProfiler()
+
+    def enable_checkpoints(self, filename: str, generations: Optional[int] = None, seconds: Optional[float] = None) -> None:
+        """
+        Save a checkpoint during run every generations generations and/or every seconds seconds
+
+        Parameters:
+        - filename:         The checkpoint file. It is overwritten by every checkpoint
+        - generations:      The number of generations between checkpoints
+        - seconds:          The minimum time between checkpoints
+        """
+        assert generations is not None or seconds is not None
+        self.checkpoint_filename = filename
+        self.checkpoint_generations = generations
+        self.checkpoint_seconds = seconds
+        self._last_checkpoint = time.monotonic()
+
+    def _checkpoint_state(self) -> dict:
+        """
+        The state needed to continue the run
+        """
+        state = {
+            "generation": self.generation,
+            "population_size": self.population_size,
+            "best_fitness": np.nan if self.best_fitness is None else self.best_fitness,
+            "all_time_best_fitness": np.nan if self.all_time_best_fitness is None else self.all_time_best_fitness,
+            "avg_fitness_log": np.array(self.avg_fitness_log, dtype=float),
+            "best_fitness_log": np.array(self.best_fitness_log, dtype=float),
+            "pMutate": np.array([mutation.pMutate for mutation in self.mutation_method], dtype=float),
+        }
+        for name, population in (
+            ("population", self.population),
+            ("best_individual", [self.best_individual]),
+            ("all_time_best_individual", [self.all_time_best_individual]),
+        ):
+            for key, array in checkpoint.pack_chromosomes(population).items():
+                state[f"{name}_{key}"] = array
+        state.update(checkpoint.random_state())
+        return state
+
+    def _restore_state(self, state: dict) -> None:
+        def chromosomes(name: str) -> list[Chromosome]:
+            return checkpoint.unpack_chromosomes({key: state[f"{name}_{key}"] for key in ("instructions", "offsets", "compact", "dtype") if f"{name}_{key}" in state})
+
+        def optional_float(value: np.ndarray) -> Optional[float]:
+            return None if np.isnan(value) else float(value)
+
+        self.generation = int(state["generation"])
+        self.population_size = int(state["population_size"])
+        self.population = chromosomes("population")
+        self.best_individual, = chromosomes("best_individual")
+        self.all_time_best_individual, = chromosomes("all_time_best_individual")
+        self.best_fitness = optional_float(state["best_fitness"])
+        self.all_time_best_fitness = optional_float(state["all_time_best_fitness"])
+        self.avg_fitness_log = state["avg_fitness_log"].tolist()
+        self.best_fitness_log = state["best_fitness_log"].tolist()
+
+        assert len(state["pMutate"]) == len(self.mutation_method)
+        for mutation, pMutate in zip(self.mutation_method, state["pMutate"]):
+            mutation.pMutate = float(pMutate)
+
+        checkpoint.set_random_state(state)
+
+    def save_checkpoint(self, filename: str) -> None:
+        """
+        Save the full state of the run, including the random generators, to a compressed .npz file
+        """
+        checkpoint.save_checkpoint(filename, self._checkpoint_state())
+        self._last_checkpoint = time.monotonic()
+
+    def resume(self, filename: str) -> None:
+        """
+        Load a checkpoint saved by save_checkpoint. The LGP must be configured like the one that saved
+        the checkpoint. Continuing with run gives exactly the same result as the uninterrupted run,
+        provided that the fitness function does not keep any state between generations
+        """
+        self._restore_state(checkpoint.load_checkpoint(filename))
+
+    def _maybe_checkpoint(self) -> None:
+        if self.checkpoint_filename is None:
+            return
+        due_generation = self.checkpoint_generations is not None and self.generation % self.checkpoint_generations == 0
+        due_time = self.checkpoint_seconds is not None and time.monotonic() - self._last_checkpoint >= self.checkpoint_seconds
+        if due_generation or due_time:
+            self.save_checkpoint(self.checkpoint_filename)
+
+    def run(self, generations: int, progress: bool = True) -> Chromosome:
+        pbar = trange(generations, desc="Best fitness: ???", disable=not progress)
 
         for g in pbar:
-            fitness = self.fitness_func(self.population)
-            self._log(fitness)
+            self.profiler.start_generation()
+            evaluated_population = self.population
+
+            with self.profiler.phase("fitness"):
+                fitness = self.fitness_func(self.population)
+            self.last_population = list(self.population)
+            self.last_fitness = list(fitness)
+            with self.profiler.phase("log"):
+                self._log(fitness)
             pbar.desc = f"Best fitness: {self.all_time_best_fitness:0.2f}"
             
             new_population = []
@@ -133,28 +261,38 @@ class LGP:
             # Add some punishment for longer chromosomes
             fitness = [f - self.len_punishment * len(c) for f, c in zip(fitness, self.population)]
 
-            while len(new_population) < self.population_size:
-                # Select parents
-                parent1_index = self.selection_method.select(fitness)
-                parent2_index = self.selection_method.select(fitness)
+            # Select all parents, two for every pair of offspring
+            with self.profiler.phase("selection"):
+                parents = self.selection_method.select_many(fitness, self.population_size + self.population_size % 2)
 
-                parent1 = self.population[parent1_index]
-                parent2 = self.population[parent2_index]
+            with self.profiler.phase("crossover"):
+                for parent1_index, parent2_index in zip(parents[::2], parents[1::2]):
+                    parent1 = self.population[parent1_index]
+                    parent2 = self.population[parent2_index]
 
-                # Generate offspring
-                offspring1, offspring2 = self.crossover_method.crossover(parent1, parent2)
-                
-                # Mutate offspring
-                offspring1 = self._mutate(offspring1)
-                offspring2 = self._mutate(offspring2)
+                    # Generate offspring
+                    offspring1, offspring2 = self.crossover_method.crossover(parent1, parent2)
 
-                # Add to the new population
-                new_population.append(offspring1)
-                new_population.append(offspring2)
+                    # Add to the new population
+                    new_population.append(offspring1)
+                    new_population.append(offspring2)
+
+            # Mutate all offspring
+            with self.profiler.phase("mutation"):
+                for mutation in self.mutation_method:
+                    new_population = mutation.mutate_population(new_population)
 
             self.population = new_population
 
-            for callback in self.generation_callback:
-                callback(self)
+            self.generation += 1
+
+            with self.profiler.phase("callbacks"):
+                for callback in self.generation_callback:
+                    callback(self)
+
+            with self.profiler.phase("checkpoint"):
+                self._maybe_checkpoint()
+
+            self.profiler.end_generation(self.generation - 1, evaluated_population[:len(fitness)], len(fitness), self.fitness_func)
         
         return self.all_time_best_individual
@@ -1,6 +1,8 @@
 from typing import Callable
+import numpy as np
 
 Instruction = tuple[int, int, int, int]
 Chromosome = tuple[Instruction,...]
 Operator = Callable[[float, float], float]
+VectorizedOperator = Callable[[np.ndarray, np.ndarray], np.ndarray]
 Fitness = Callable[[Chromosome], float]
\ No newline at end of file
@@ -0,0 +1,78 @@
+import heapq
+from typing import Iterable, Optional
+
+from LGP._typing import Chromosome, Operator
+from LGP.evaluation import Operators
+
+
+# Operators that only read their first operand
+UNARY_OPERATORS: set[Operator] = {
+    Operators.Sin,
+    Operators.Cos,
+    Operators.Sqrt,
+}
+
+# Operators where the order of the operands does not matter
+COMMUTATIVE_OPERATORS: set[Operator] = {
+    Operators.Add,
+    Operators.Mult,
+}
+
+
+def effective_program(chromosome: Chromosome, output_registers: Iterable[int], operations: Optional[list[Operator]] = None) -> Chromosome:
+    """
+    Remove all introns from a chromosome. An instruction is an intron if its destination register is
+    overwritten or never read before the program ends, i.e. it can not affect the output registers.
+    The effective program gives the same values in the output registers as the full chromosome
+
+    Parameters:
+    - chromosome:           The chromosome to analyse
+    - output_registers:     The registers that are read after the program has run
+    - operations:           The operators of the chromosome. If given, the second operand of unary operators is ignored
+
+    Returns:
+    - chromosome:           The effective program
+    """
+    unary = [operator in UNARY_OPERATORS for operator in operations] if operations is not None else None
+
+    effective_registers = set(output_registers)
+    effective_instructions = []
+
+    # Backward data-flow analysis. Track the registers that are read later in the program
+    for instruction in reversed(chromosome):
+        operandIndex1, operandIndex2, operatorIndex, destinationIndex = instruction
+        if destinationIndex not in effective_registers:
+            continue
+
+        effective_registers.discard(destinationIndex)
+        effective_registers.add(operandIndex1)
+        if unary is None or not unary[operatorIndex]:
+            effective_registers.add(operandIndex2)
+        effective_instructions.append(instruction)
+
+    return tuple(reversed(effective_instructions))
+
+
+def balanced_chunks(costs: list[float], n_chunks: int) -> list[list[int]]:
+    """
+    Split items into chunks with roughly equal total cost. The most expensive items are placed
+    first, each in the chunk with the lowest total cost so far
+
+    Parameters:
+    - costs:            The cost of every item
+    - n_chunks (int):   The maximum number of chunks
+
+    Returns:
+    - chunks:           The indices of the items in every non-empty chunk, the most expensive chunk first
+    """
+    assert n_chunks > 0
+
+    chunks: list[list[int]] = [[] for _ in range(min(n_chunks, len(costs)))]
+    heap = [(0.0, i) for i in range(len(chunks))]
+    for index in sorted(range(len(costs)), key=lambda i: costs[i], reverse=True):
+        total, chunk = heapq.heappop(heap)
+        chunks[chunk].append(index)
+        heapq.heappush(heap, (total + costs[index], chunk))
+
+    totals = {chunk: total for total, chunk in heap}
+    return [chunks[chunk] for chunk in sorted(range(len(chunks)), key=lambda c: totals[c], reverse=True)]
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from LGP._typing import Chromosome, Operator
+from LGP.analysis import effective_program, UNARY_OPERATORS
+from LGP.fitness import FitnessBase
+
+
+class CachedFitness(FitnessBase):
+    """
+    Memoize the fitness of another fitness function. Individuals are identified by their effective
+    program, so offspring that are copies of a parent or only differ in introns are never re-evaluated.
+    The wrapped fitness function must only depend on the output registers of a chromosome. Fitness values
+    that a MimicTrainingDataRacing marks as lower bounds are not cached
+
+    Parameters:
+    - fitness_func:         The fitness function to cache
+    - output_registers:     The registers that are read after the program has run
+    - operators:            The operators of the chromosomes. Used to ignore the second operand of unary operators
+    - maxsize (int):        The maximum number of cached individuals. The least recently used are discarded first
+    """
+
+    def __init__(self, fitness_func: FitnessBase, output_registers: Iterable[int], operators: Optional[list[Operator]] = None, maxsize: int = 100_000) -> None:
+        super().__init__()
+        assert maxsize > 0
+
+        self.fitness_func = fitness_func
+        self.output_registers = tuple(output_registers)
+        self.operators = operators
+        self.maxsize = maxsize
+
+        self.cache: OrderedDict[Chromosome, float] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def key(self, individual: Chromosome) -> Chromosome:
+        """
+        Return the canonical effective program of an individual
+        """
+        program = effective_program(individual, self.output_registers, self.operators)
+        if self.operators is None:
+            return tuple(tuple(instruction) for instruction in program)
+
+        # The second operand of a unary operator does not matter
+        return tuple(
+            (op1, 0, op, dst) if self.operators[op] in UNARY_OPERATORS else (op1, op2, op, dst)
+            for op1, op2, op, dst in program
+        )
+
+    def clear(self) -> None:
+        """
+        Empty the cache and reset the counters
+        """
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        """
+        Close the wrapped fitness function
+        """
+        self.fitness_func.close()
+
+    def __call__(self, populaiton: list[Chromosome]) -> list[float]:
+        keys = [self.key(individual) for individual in populaiton]
+
+        known: dict[Chromosome, float] = {}
+        missing: dict[Chromosome, Chromosome] = {}
+        for key, individual in zip(keys, populaiton):
+            if key in known or key in missing:
+                self.hits += 1
+            elif key in self.cache:
+                self.cache.move_to_end(key)
+                known[key] = self.cache[key]
+                self.hits += 1
+            else:
+                missing[key] = individual
+                self.misses += 1
+
+        # Only evaluate one representative of every unknown program
+        if missing:
+            fitness = self.fitness_func(list(missing.values()))
+            # The lower bounds of MimicTrainingDataRacing depend on the threshold of the generation
+            lower_bound = getattr(self.fitness_func, "lower_bound", None) or [False] * len(fitness)
+            for key, f, bound in zip(missing, fitness, lower_bound):
+                known[key] = f
+                if not bound:
+                    self.cache[key] = f
+
+            while len(self.cache) > self.maxsize:
+                self.cache.popitem(last=False)
+
+        return [known[key] for key in keys]
@@ -0,0 +1,98 @@
+import os
+import random
+from typing import Any
+import numpy as np
+
+from LGP._typing import Chromosome
+from LGP.genome import CompactChromosome, concatenate, from_array
+
+
+def pack_chromosomes(population: list[Chromosome]) -> dict[str, np.ndarray]:
+    """
+    Pack a list of chromosomes into arrays
+    """
+    instructions, offsets = concatenate(population)
+    compact = [isinstance(chromosome, CompactChromosome) for chromosome in population]
+    dtypes = [chromosome.dtype.str if is_compact else "" for chromosome, is_compact in zip(population, compact)]
+    return {
+        "instructions": instructions.astype(np.int32),
+        "offsets": offsets,
+        "compact": np.array(compact, dtype=bool),
+        "dtype": np.array(dtypes, dtype=str),
+    }
+
+
+def unpack_chromosomes(arrays: dict[str, np.ndarray]) -> list[Chromosome]:
+    """
+    Unpack chromosomes packed by pack_chromosomes
+    """
+    instructions = arrays["instructions"]
+    offsets = arrays["offsets"]
+    # Checkpoints without dtypes only contain chromosomes with the default dtype
+    dtypes = arrays.get("dtype")
+    if dtypes is None:
+        dtypes = [""] * len(arrays["compact"])
+
+    population = []
+    for compact, dtype, start, stop in zip(arrays["compact"], dtypes, offsets[:-1], offsets[1:]):
+        template = CompactChromosome(dtype=np.dtype(str(dtype)) if dtype else np.uint16) if compact else tuple()
+        population.append(from_array(template, instructions[start:stop]))
+    return population
+
+
+def random_state() -> dict[str, np.ndarray]:
+    """
+    Return the state of the random generators of random and NumPy as arrays
+    """
+    version, internal_state, gauss_next = random.getstate()
+    name, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    return {
+        "random_version": np.array(version),
+        "random_state": np.array(internal_state, dtype=np.uint64),
+        "random_gauss": np.array(np.nan if gauss_next is None else gauss_next),
+        "numpy_name": np.array(name),
+        "numpy_keys": keys,
+        "numpy_pos": np.array(pos),
+        "numpy_has_gauss": np.array(has_gauss),
+        "numpy_gauss": np.array(cached_gaussian),
+    }
+
+
+def set_random_state(arrays: dict[str, np.ndarray]) -> None:
+    """
+    Restore the state of the random generators saved by random_state
+    """
+    gauss_next = float(arrays["random_gauss"])
+    random.setstate((
+        int(arrays["random_version"]),
+        tuple(int(i) for i in arrays["random_state"]),
+        None if np.isnan(gauss_next) else gauss_next,
+    ))
+    np.random.set_state((
+        str(arrays["numpy_name"]),
+        arrays["numpy_keys"],
+        int(arrays["numpy_pos"]),
+        int(arrays["numpy_has_gauss"]),
+        float(arrays["numpy_gauss"]),
+    ))
+
+
+def save_checkpoint(filename: str, arrays: dict[str, Any]) -> None:
+    """
+    Save arrays to a compressed .npz file. The file is written atomically, so an interrupted
+    save never leaves a broken checkpoint behind
+    """
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "wb") as f:
+        np.savez_compressed(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_filename, filename)
+
+
+def load_checkpoint(filename: str) -> dict[str, np.ndarray]:
+    """
+    Load the arrays saved by save_checkpoint
+    """
+    with np.load(filename) as data:
+        return {key: data[key] for key in data.files}
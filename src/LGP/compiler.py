@@ -0,0 +1,91 @@
+import builtins
+from functools import lru_cache
+import math
+from typing import Callable
+
+from LGP._typing import Chromosome, Operator
+from LGP.evaluation import Operators
+
+
+CompiledChromosome = Callable[[list[float]], list[float]]
+
+
+# Operators that are written as an expression instead of a function call
+INLINE_OPERATORS: dict[Operator, str] = {
+    Operators.Add: "{} + {}",
+    Operators.Sub: "{} - {}",
+    Operators.Mult: "{} * {}",
+}
+
+
+def _constant_source(value: float) -> str | None:
+    """
+    Return the source code for a constant or None if it can not be written as a literal
+    """
+    if type(value) in (int, float) and math.isfinite(value):
+        return repr(value)
+    return None
+
+
+def generate_source(chromosome: Chromosome, operators: list[Operator], nVar: int, constReg: list[float]) -> tuple[str, dict]:
+    """
+    Generate the source code of a function that evaluates the chromosome
+
+    Returns:
+    - source:           The source code of the function "program"
+    - namespace:        The globals needed by the function
+    """
+    namespace = {}
+    operands = [f"r{i}" for i in range(nVar)]
+    for i, value in enumerate(constReg):
+        literal = _constant_source(value)
+        if literal is None:
+            literal = f"c{i}"
+            namespace[literal] = value
+        operands.append(literal)
+
+    lines = ["def program(varReg):"]
+    if nVar > 0:
+        lines.append(f"    {', '.join(operands[:nVar])}, = varReg")
+
+    for operandIndex1, operandIndex2, operatorIndex, destinationIndex in chromosome:
+        operator = operators[operatorIndex]
+        op1 = operands[operandIndex1]
+        op2 = operands[operandIndex2]
+
+        if operator in INLINE_OPERATORS:
+            expression = INLINE_OPERATORS[operator].format(op1, op2)
+        else:
+            namespace[f"op{operatorIndex}"] = operator
+            expression = f"op{operatorIndex}({op1}, {op2})"
+        lines.append(f"    {operands[destinationIndex]} = {expression}")
+
+    lines.append(f"    return [{', '.join(operands[:nVar])}]")
+    return "\n".join(lines) + "\n", namespace
+
+
+@lru_cache(maxsize=1024)
+def _compile(chromosome: Chromosome, operators: tuple[Operator, ...], nVar: int, constReg: tuple[float, ...]) -> CompiledChromosome:
+    source, namespace = generate_source(chromosome, list(operators), nVar, list(constReg))
+    code = builtins.compile(source, "<chromosome>", "exec")
+    exec(code, namespace)
+    return namespace["program"]
+
+
+def compile(chromosome: Chromosome, operators: list[Operator], nVar: int, constReg: list[float]) -> CompiledChromosome:
+    """
+    Compile a chromosome to a Python function. The function takes the variable register and returns
+    the variable register after evaluation, just like evaluate, but without interpreting the chromosome
+    on every call. Compiled chromosomes are cached
+
+    Parameters:
+    - chromosome:       The chromosome to compile
+    - operators:        The operators used by the chromosome
+    - nVar (int):       The number of variable registers
+    - constReg:         The constant register. The constants are inlined in the function
+
+    Returns:
+    - program:          The compiled chromosome
+    """
+    chromosome = tuple(tuple(int(i) for i in instruction) for instruction in chromosome)
+    return _compile(chromosome, tuple(operators), nVar, tuple(constReg))
@@ -0,0 +1,197 @@
+from collections import OrderedDict
+from typing import Iterable, Optional
+import numpy as np
+
+from LGP._typing import Chromosome, Operator, VectorizedOperator
+from LGP.analysis import effective_program, UNARY_OPERATORS, COMMUTATIVE_OPERATORS
+from LGP.fitness import MimicTrainingData
+
+
+class ExpressionDAG:
+    """
+    Evaluate chromosomes as expressions over the initial registers. Every value a chromosome computes
+    is a node (operator, operand1, operand2) in a shared, hash-consed graph, so identical
+    sub-computations in different chromosomes are the same node and only evaluated once.
+    The operands of commutative operators are sorted and the second operand of unary operators is
+    ignored, which gives bit-identical results.
+
+    The nodes 0 to nVar + nConst - 1 are the initial registers. The values of the other nodes are kept
+    in a least recently used cache that holds at most max_bytes of data
+
+    Parameters:
+    - operations:           Vectorized operators, see vectorize_operators
+    - varReg:               The initial variable register with shape (nVar, n_samples)
+    - constReg:             The constant register
+    - output_registers:     The registers that are read after the program has run
+    - operators:            The scalar operators. Used to find unary and commutative operators
+    - max_bytes (int):      The maximum size of the cached node values
+    - max_nodes (int):      The graph and the cache are cleared when the graph has more nodes than this
+    """
+
+    def __init__(
+            self,
+            operations: list[VectorizedOperator],
+            varReg: np.ndarray,
+            constReg: list[float],
+            output_registers: Iterable[int],
+            operators: Optional[list[Operator]] = None,
+            max_bytes: int = 256 * 2**20,
+            max_nodes: int = 1_000_000,
+    ) -> None:
+        varReg = np.asarray(varReg, dtype=float)
+        nVar, n_samples = varReg.shape
+
+        self.operations = operations
+        self.output_registers = tuple(output_registers)
+        self.operators = operators
+        self.max_nodes = max_nodes
+
+        self.registers = np.empty((nVar + len(constReg), n_samples))
+        self.registers[:nVar] = varReg
+        self.registers[nVar:] = np.asarray(constReg, dtype=float).reshape((-1, 1))
+        self.n_registers = self.registers.shape[0]
+
+        self.maxsize = max(1, max_bytes // max(1, self.registers[0].nbytes))
+        self.unary = [op in UNARY_OPERATORS for op in operators or ()]
+        self.commutative = [op in COMMUTATIVE_OPERATORS for op in operators or ()]
+
+        self.nodes: dict[tuple[int, int, int], int] = {}
+        self.expressions: list[tuple[int, int, int]] = []
+        self.cache: OrderedDict[int, np.ndarray] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self) -> None:
+        """
+        Discard the graph and the cached values and reset the counters
+        """
+        self.nodes.clear()
+        self.expressions.clear()
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def outputs(self, chromosome: Chromosome) -> tuple[int, ...]:
+        """
+        Add the effective code of a chromosome to the graph and return the nodes in the output registers
+        """
+        if len(self.expressions) > self.max_nodes:
+            self.clear()
+
+        register_nodes = list(range(self.n_registers))
+        for operandIndex1, operandIndex2, operatorIndex, destinationIndex in effective_program(chromosome, self.output_registers, self.operators):
+            operand1 = register_nodes[operandIndex1]
+            operand2 = register_nodes[operandIndex2]
+            if self.operators is not None:
+                if self.unary[operatorIndex]:
+                    operand2 = -1
+                elif self.commutative[operatorIndex] and operand2 < operand1:
+                    operand1, operand2 = operand2, operand1
+
+            expression = (operatorIndex, operand1, operand2)
+            node = self.nodes.get(expression)
+            if node is None:
+                node = self.n_registers + len(self.expressions)
+                self.nodes[expression] = node
+                self.expressions.append(expression)
+            register_nodes[destinationIndex] = node
+
+        return tuple(register_nodes[register] for register in self.output_registers)
+
+    def _cached(self, node: int) -> Optional[np.ndarray]:
+        if node < self.n_registers:
+            return self.registers[node]
+        value = self.cache.get(node)
+        if value is not None:
+            self.cache.move_to_end(node)
+        return value
+
+    def value(self, node: int, values: Optional[dict[int, np.ndarray]] = None) -> np.ndarray:
+        """
+        Return the value of a node for all samples
+
+        Parameters:
+        - node:         The node to evaluate
+        - values:       Node values already known by the caller. Updated with the evaluated nodes
+        """
+        values = {} if values is None else values
+        stack = [node]
+        with np.errstate(all="ignore"):
+            while stack:
+                current = stack[-1]
+                if current in values:
+                    stack.pop()
+                    continue
+
+                value = self._cached(current)
+                if value is not None:
+                    if current >= self.n_registers:
+                        self.hits += 1
+                    values[current] = value
+                    stack.pop()
+                    continue
+
+                operatorIndex, operand1, operand2 = self.expressions[current - self.n_registers]
+                missing = [operand for operand in (operand1, operand2) if operand >= 0 and operand not in values]
+                if missing:
+                    stack.extend(missing)
+                    continue
+
+                stack.pop()
+                x = values[operand1]
+                value = self.operations[operatorIndex](x, x if operand2 < 0 else values[operand2])
+                self.misses += 1
+
+                values[current] = value
+                self.cache[current] = value
+                if len(self.cache) > self.maxsize:
+                    self.cache.popitem(last=False)
+
+        return values[node]
+
+    def evaluate(self, chromosome: Chromosome) -> np.ndarray:
+        """
+        Evaluate a chromosome on all samples
+
+        Returns:
+        - output:       The output registers after evaluation with shape (len(output_registers), n_samples)
+        """
+        values: dict[int, np.ndarray] = {}
+        return np.array([self.value(node, values) for node in self.outputs(chromosome)])
+
+
+class MimicTrainingDataCSE(MimicTrainingData):
+    """
+    MimicTrainingData that evaluates the population with an ExpressionDAG, so sub-computations that
+    several individuals share are only evaluated once. Always vectorized
+
+    Parameters:
+    - max_bytes (int):      The maximum size of the cached node values
+    - persistent (bool):    Keep the graph and the cached values between generations
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, nVar: int, constReg: list[float], operators: list[Operator], max_bytes: int = 256 * 2**20, persistent: bool = True) -> None:
+        super().__init__(x, y, nVar, constReg, operators, vectorized=True)
+        self.persistent = persistent
+
+        varReg = np.zeros((nVar, self.training_samples))
+        varReg[:self.input_len] = x.T
+        self.dag = ExpressionDAG(self.vectorized_operators, varReg, constReg, range(self.output_len), operators, max_bytes)
+
+    def fitness(self, individual: Chromosome) -> float:
+        yh = self.dag.evaluate(individual)
+
+        diff = self.y.T - yh
+        error = np.sqrt(np.sum(diff * diff, axis=0))
+
+        return float(np.sum(error)) / self.training_samples
+
+    def __call__(self, populaiton: list[Chromosome]) -> list[float]:
+        if not self.persistent:
+            self.dag.clear()
+        return super().__call__(populaiton)
@@ -0,0 +1,208 @@
+from abc import ABC, abstractmethod
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Iterable, Iterator
+import weakref
+import numpy as np
+
+
+Chunk = tuple[np.ndarray, np.ndarray]
+
+
+def _release(shm: SharedMemory, unlink: bool) -> None:
+    shm.close()
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _attach(name: str) -> SharedMemory:
+    try:
+        # Only the creator of the block should track it, otherwise it is removed when a worker exits
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        return SharedMemory(name=name)
+
+
+class SharedArray:
+    """
+    A read-only array in shared memory. When pickled, only the name of the memory block is sent and
+    the receiver attaches to the same memory, so the data is never copied between processes.
+    The process that created the array removes the memory block on close, when the array is garbage
+    collected or when the interpreter exits, also after an exception or KeyboardInterrupt
+
+    Parameters:
+    - array:        The data to place in shared memory
+    """
+
+    def __init__(self, array: np.ndarray) -> None:
+        array = np.asarray(array)
+        self.shape = array.shape
+        self.dtype = array.dtype
+
+        self.shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.name = self.shm.name
+        self.array = self._view()
+        self.array.setflags(write=True)
+        self.array[...] = array
+        self.array.setflags(write=False)
+
+        self._finalizer = weakref.finalize(self, _release, self.shm, True)
+
+    def _view(self) -> np.ndarray:
+        array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf)
+        array.setflags(write=False)
+        return array
+
+    def close(self) -> None:
+        """
+        Detach from the memory block. The block is removed if this process created it
+        """
+        self.array = None
+        self._finalizer()
+
+    def __getstate__(self) -> dict:
+        return {"name": self.name, "shape": self.shape, "dtype": self.dtype.str}
+
+    def __setstate__(self, state: dict) -> None:
+        self.name = state["name"]
+        self.shape = state["shape"]
+        self.dtype = np.dtype(state["dtype"])
+
+        self.shm = _attach(self.name)
+        self.array = self._view()
+        self._finalizer = weakref.finalize(self, _release, self.shm, False)
+
+
+class DataSource(ABC):
+    """
+    Training data that is read in chunks. Every call to chunks starts a new pass over the data
+
+    Attributes:
+    - input_len (int):  The number of inputs of a sample
+    - output_len (int): The number of outputs of a sample
+    """
+
+    input_len: int
+    output_len: int
+
+    @abstractmethod
+    def chunks(self) -> Iterator[Chunk]:
+        """
+        Iterate over the training data
+
+        Returns:
+        - chunks:   Pairs of input data with shape (chunk_size, input_len) and output data with shape (chunk_size, output_len)
+        """
+
+
+class ArrayDataSource(DataSource):
+    """
+    Read the training data in chunks from arrays. Works with any array that supports slicing,
+    for example an np.memmap, where only the current chunk is read into memory
+
+    Parameters:
+    - x:                    Input data with shape (n_samples, input_len)
+    - y:                    Output data with shape (n_samples, output_len)
+    - chunk_size (int):     The number of samples in every chunk
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, chunk_size: int = 10_000) -> None:
+        super().__init__()
+        assert len(x.shape) == 2
+        assert len(y.shape) == 2
+        assert x.shape[0] == y.shape[0]
+        assert chunk_size > 0
+
+        self.x = x
+        self.y = y
+        self.chunk_size = chunk_size
+
+        self.training_samples = x.shape[0]
+        self.input_len = x.shape[1]
+        self.output_len = y.shape[1]
+
+    def chunks(self) -> Iterator[Chunk]:
+        for start in range(0, self.training_samples, self.chunk_size):
+            stop = start + self.chunk_size
+            yield np.asarray(self.x[start:stop]), np.asarray(self.y[start:stop])
+
+
+class NpyDataSource(ArrayDataSource):
+    """
+    Read the training data in chunks from memory mapped .npy files. When pickled, e.g. to send it to
+    a worker process, only the paths are sent and the files are mapped again by the receiver
+
+    Parameters:
+    - x_path:               Path to the input data with shape (n_samples, input_len)
+    - y_path:               Path to the output data with shape (n_samples, output_len)
+    - chunk_size (int):     The number of samples in every chunk
+    """
+
+    def __init__(self, x_path: str, y_path: str, chunk_size: int = 10_000) -> None:
+        self.x_path = x_path
+        self.y_path = y_path
+        super().__init__(np.load(x_path, mmap_mode="r"), np.load(y_path, mmap_mode="r"), chunk_size)
+
+    def __getstate__(self) -> dict:
+        return {"x_path": self.x_path, "y_path": self.y_path, "chunk_size": self.chunk_size}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
+
+
+class IteratorDataSource(DataSource):
+    """
+    Read the training data from an iterable of chunks, e.g. a generator reading a file
+
+    Parameters:
+    - factory:      Called at the start of every pass over the data. Returns an iterable of (x_chunk, y_chunk)
+    """
+
+    def __init__(self, factory: Callable[[], Iterable[Chunk]]) -> None:
+        super().__init__()
+        self.factory = factory
+
+        # Peek at the first chunk to get the shape of the data
+        x, y = next(iter(factory()))
+        assert len(x.shape) == 2
+        assert len(y.shape) == 2
+        self.input_len = x.shape[1]
+        self.output_len = y.shape[1]
+
+    def chunks(self) -> Iterator[Chunk]:
+        for x, y in self.factory():
+            assert x.shape[0] == y.shape[0]
+            yield np.asarray(x), np.asarray(y)
+
+
+class SharedMemoryDataSource(ArrayDataSource):
+    """
+    Read the training data in chunks from shared memory. When pickled, e.g. to send it to a worker
+    process, only the names of the memory blocks are sent
+
+    Parameters:
+    - x:                    Input data with shape (n_samples, input_len), copied to shared memory
+    - y:                    Output data with shape (n_samples, output_len), copied to shared memory
+    - chunk_size (int):     The number of samples in every chunk
+    """
+
+    def __init__(self, x: np.ndarray | SharedArray, y: np.ndarray | SharedArray, chunk_size: int = 10_000) -> None:
+        self.shared_x = x if isinstance(x, SharedArray) else SharedArray(x)
+        self.shared_y = y if isinstance(y, SharedArray) else SharedArray(y)
+        super().__init__(self.shared_x.array, self.shared_y.array, chunk_size)
+
+    def close(self) -> None:
+        """
+        Release the shared memory
+        """
+        self.x = self.y = None
+        self.shared_x.close()
+        self.shared_y.close()
+
+    def __getstate__(self) -> dict:
+        return {"x": self.shared_x, "y": self.shared_y, "chunk_size": self.chunk_size}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
@@ -0,0 +1,356 @@
+import argparse
+import hashlib
+import pickle
+import selectors
+import socket
+import struct
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Optional
+import numpy as np
+
+from LGP._typing import Chromosome, Operator
+from LGP.fitness import MimicFitnessBase, MimicTrainingData
+from LGP.genome import concatenate
+
+
+# Every message is a pickled object prefixed by its length. Only use the protocol on a trusted network
+_HEADER = struct.Struct("!Q")
+
+
+def send_message(sock: socket.socket, message: Any) -> None:
+    data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _receive_exactly(sock: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError("Connection closed")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def receive_message(sock: socket.socket) -> Any:
+    size, = _HEADER.unpack(_receive_exactly(sock, _HEADER.size))
+    return pickle.loads(_receive_exactly(sock, size))
+
+
+def file_hash(path: str) -> str:
+    """
+    Return the SHA-256 hash of a file
+    """
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(2**20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def pack_batch(programs: list[Chromosome]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pack chromosomes into a uint16 instruction array and offsets, see genome.concatenate
+    """
+    instructions, offsets = concatenate(programs)
+    return instructions.astype(np.uint16), offsets
+
+
+def unpack_batch(instructions: np.ndarray, offsets: np.ndarray) -> list[Chromosome]:
+    return [tuple(map(tuple, instructions[start:stop].tolist())) for start, stop in zip(offsets[:-1], offsets[1:])]
+
+
+def run_worker(host: str, port: int, heartbeat_interval: float = 1.0) -> None:
+    """
+    Connect to a DistributedFitness coordinator and evaluate batches until the coordinator stops.
+    The worker loads the training data from the paths sent by the coordinator and checks that the
+    files have the same hash as on the coordinator
+
+    Parameters:
+    - host:                 The address of the coordinator
+    - port (int):           The port of the coordinator
+    - heartbeat_interval:   The time between heartbeats to the coordinator
+    """
+    sock = socket.create_connection((host, port))
+    lock = threading.Lock()
+    stopped = threading.Event()
+
+    def send(message: Any) -> None:
+        with lock:
+            send_message(sock, message)
+
+    def heartbeat() -> None:
+        while not stopped.wait(heartbeat_interval):
+            try:
+                send(("heartbeat",))
+            except OSError:
+                return
+
+    try:
+        command, config = receive_message(sock)
+        assert command == "setup"
+        try:
+            for key in ("x", "y"):
+                if file_hash(config[f"{key}_path"]) != config[f"{key}_hash"]:
+                    raise ValueError(f"{config[f'{key}_path']} differs from the file on the coordinator")
+            fitness_func = MimicTrainingData(
+                np.load(config["x_path"]), np.load(config["y_path"]),
+                config["nVar"], config["constReg"], config["operators"], config["vectorized"],
+            )
+        except Exception:
+            send(("error", None, traceback.format_exc()))
+            return
+
+        send(("ready",))
+        threading.Thread(target=heartbeat, daemon=True).start()
+
+        while True:
+            command, *args = receive_message(sock)
+            if command == "evaluate":
+                task, instructions, offsets = args
+                try:
+                    fitness = [fitness_func.fitness(program) for program in unpack_batch(instructions, offsets)]
+                except Exception:
+                    send(("error", task, traceback.format_exc()))
+                    continue
+                send(("result", task, fitness))
+            elif command == "stop":
+                return
+    except (EOFError, OSError):
+        return
+    finally:
+        stopped.set()
+        sock.close()
+
+
+class _Worker:
+
+    def __init__(self, sock: socket.socket, address: Any) -> None:
+        self.sock = sock
+        self.address = address
+        self.ready = False
+        # (call, batch) pairs that were sent and not answered
+        self.tasks: set[tuple[int, int]] = set()
+        self.last_seen = time.monotonic()
+
+
+class DistributedFitness(MimicFitnessBase):
+    """
+    Same fitness as MimicTrainingData, but the population is evaluated by workers on other hosts that
+    connect over TCP, see run_worker. Workers can join and leave at any time. The training data is
+    loaded by the workers from x_path and y_path, which must be reachable from every host, and the
+    file hashes are compared before a worker is used.
+
+    The effective programs are sent to the workers in batches. A batch is sent to another worker if its
+    worker disconnects or has not sent anything, e.g. a heartbeat, in heartbeat_timeout seconds.
+    If a batch fails on a worker, the batches still out on other workers are collected before the
+    error is raised, and replies that arrive late are ignored by the next call.
+    The messages are pickled, so only use it on a trusted network
+
+    Parameters:
+    - x_path:                   Path to a .npy file with input data of shape (n_samples, input_len)
+    - y_path:                   Path to a .npy file with output data of shape (n_samples, output_len)
+    - nVar (int):               The number of variable registers
+    - constReg:                 The constant register
+    - operators:                The operators used by the chromosomes. Must be importable on the workers
+    - host:                     The address to listen on
+    - port (int):               The port to listen on. A free port is chosen if 0, see address
+    - batch_size (int):         The number of individuals in a batch
+    - tasks_per_worker (int):   The number of batches a worker is given at a time
+    - heartbeat_timeout:        Seconds of silence before the batches of a worker are sent to other workers
+    - worker_timeout:           Seconds to wait for a worker to connect before giving up
+    - vectorized:               Evaluate every chromosome on all samples at once with NumPy
+    """
+
+    def __init__(
+            self,
+            x_path: str,
+            y_path: str,
+            nVar: int,
+            constReg: list[float],
+            operators: list[Operator],
+            host: str = "localhost",
+            port: int = 0,
+            batch_size: int = 50,
+            tasks_per_worker: int = 2,
+            heartbeat_timeout: float = 10.0,
+            worker_timeout: float = 60.0,
+            vectorized: bool = True,
+    ) -> None:
+        x = np.load(x_path, mmap_mode="r")
+        y = np.load(y_path, mmap_mode="r")
+        assert len(x.shape) == 2
+        assert len(y.shape) == 2
+        assert x.shape[0] == y.shape[0]
+        assert batch_size > 0
+        assert tasks_per_worker > 0
+
+        super().__init__(x.shape[1], y.shape[1], nVar, constReg, operators, vectorized)
+
+        self.config = {
+            "x_path": x_path,
+            "y_path": y_path,
+            "x_hash": file_hash(x_path),
+            "y_hash": file_hash(y_path),
+            "nVar": nVar,
+            "constReg": constReg,
+            "operators": operators,
+            "vectorized": vectorized,
+        }
+        self.batch_size = batch_size
+        self.tasks_per_worker = tasks_per_worker
+        self.heartbeat_timeout = heartbeat_timeout
+        self.worker_timeout = worker_timeout
+
+        self.listener = socket.create_server((host, port))
+        self.listener.setblocking(False)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        self.workers: dict[socket.socket, _Worker] = {}
+
+        # The number of batches that were sent to another worker
+        self.retries = 0
+        # Tasks are tagged with the call they belong to, so late replies to an earlier call are ignored
+        self.calls = 0
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self.listener.getsockname()[:2]
+
+    def _accept(self) -> None:
+        sock, address = self.listener.accept()
+        sock.settimeout(self.heartbeat_timeout)
+        worker = _Worker(sock, address)
+        try:
+            send_message(sock, ("setup", self.config))
+        except OSError:
+            sock.close()
+            return
+        self.workers[sock] = worker
+        self.selector.register(sock, selectors.EVENT_READ)
+
+    def _remove(self, worker: _Worker, pending: deque[int]) -> None:
+        """
+        Disconnect a worker and queue its batches again
+        """
+        self.selector.unregister(worker.sock)
+        del self.workers[worker.sock]
+        worker.sock.close()
+        tasks = [batch for call, batch in worker.tasks if call == self.calls]
+        pending.extendleft(tasks)
+        self.retries += len(tasks)
+
+    def _handle(self, worker: _Worker, results: dict[int, list[float]], pending: deque[int], errors: list[str]) -> None:
+        try:
+            message = receive_message(worker.sock)
+        except (EOFError, OSError):
+            self._remove(worker, pending)
+            return
+
+        worker.last_seen = time.monotonic()
+        command, *args = message
+        if command == "ready":
+            worker.ready = True
+        elif command == "result":
+            task, fitness = args
+            worker.tasks.discard(task)
+            call, batch = task
+            if call == self.calls:
+                results.setdefault(batch, fitness)
+        elif command == "error":
+            task, error = args
+            if not worker.ready:
+                # The worker could not load the training data
+                self._remove(worker, pending)
+                return
+            worker.tasks.discard(task)
+            if task[0] == self.calls:
+                errors.append(f"Worker {worker.address} failed:\n{error}")
+
+    def __call__(self, populaiton: list[Chromosome]) -> list[float]:
+        programs = [self.effective_program(individual) for individual in populaiton]
+        batches = [pack_batch(programs[i:i + self.batch_size]) for i in range(0, len(programs), self.batch_size)]
+
+        self.calls += 1
+        pending = deque(range(len(batches)))
+        results: dict[int, list[float]] = {}
+        errors: list[str] = []
+        last_worker = time.monotonic()
+
+        while len(results) < len(batches):
+            if errors:
+                # Collect the batches that are still out before raising, so the workers are idle afterwards
+                pending.clear()
+                if not any(worker.tasks for worker in self.workers.values()):
+                    break
+
+            # Hand out the batches that are not done
+            for worker in list(self.workers.values()):
+                while worker.ready and pending and len(worker.tasks) < self.tasks_per_worker:
+                    batch = pending.popleft()
+                    if batch in results:
+                        continue
+                    if not worker.tasks:
+                        # Heartbeats from an idle worker are not read, so start the clock now
+                        worker.last_seen = time.monotonic()
+                    task = (self.calls, batch)
+                    worker.tasks.add(task)
+                    try:
+                        send_message(worker.sock, ("evaluate", task, *batches[batch]))
+                    except OSError:
+                        self._remove(worker, pending)
+                        break
+
+            # Retry the batches of silent workers
+            now = time.monotonic()
+            for worker in list(self.workers.values()):
+                if worker.tasks and now - worker.last_seen > self.heartbeat_timeout:
+                    self._remove(worker, pending)
+
+            if self.workers:
+                last_worker = now
+            elif now - last_worker > self.worker_timeout:
+                raise RuntimeError("No workers connected")
+
+            for key, _ in self.selector.select(timeout=min(1.0, self.heartbeat_timeout)):
+                if key.fileobj is self.listener:
+                    self._accept()
+                elif key.fileobj in self.workers:
+                    self._handle(self.workers[key.fileobj], results, pending, errors)
+
+        if errors:
+            raise RuntimeError(errors[0])
+        return [f for task in range(len(batches)) for f in results[task]]
+
+    def close(self) -> None:
+        """
+        Stop the workers and the listener
+        """
+        for sock in list(self.workers):
+            try:
+                send_message(sock, ("stop",))
+            except OSError:
+                pass
+            self.selector.unregister(sock)
+            sock.close()
+        self.workers = {}
+        if self.listener.fileno() != -1:
+            self.selector.unregister(self.listener)
+            self.listener.close()
+            self.selector.close()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Evaluate fitness for a DistributedFitness coordinator")
+    parser.add_argument("host", help="The address of the coordinator")
+    parser.add_argument("port", type=int, help="The port of the coordinator")
+    parser.add_argument("--heartbeat", type=float, default=1.0, help="Seconds between heartbeats")
+    args = parser.parse_args(argv)
+    run_worker(args.host, args.port, args.heartbeat)
+
+
+if __name__ == "__main__":
+    main()
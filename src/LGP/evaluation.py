@@ -1,6 +1,7 @@
 import math
+import numpy as np
 
-from ._typing import Operator, Chromosome
+from ._typing import Operator, Chromosome, VectorizedOperator
 
 
 class Operators:
@@ -40,6 +41,83 @@ class Operators:
         return math.atan2(y, x)
 
 
+class VectorizedOperators:
+    """
+    NumPy counterparts of Operators. Every operator works elementwise on whole rows of the register,
+    i.e. on one value per training sample, with the same semantics as the scalar version
+    """
+
+    @staticmethod
+    def Add(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return x + y
+
+    @staticmethod
+    def Sub(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return x - y
+
+    @staticmethod
+    def Mult(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return x * y
+
+    @staticmethod
+    def Div(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        out = np.full(np.broadcast_shapes(np.shape(x), np.shape(y)), 10_000_000.0)
+        return np.divide(x, y, out=out, where=y != 0)
+
+    @staticmethod
+    def Sin(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return np.sin(x)
+
+    @staticmethod
+    def Cos(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return np.cos(x)
+
+    @staticmethod
+    def Sqrt(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return np.sqrt(np.abs(x))
+
+    @staticmethod
+    def Atan2(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return np.arctan2(y, x)
+
+
+VECTORIZED_OPERATORS: dict[Operator, VectorizedOperator] = {
+    Operators.Add: VectorizedOperators.Add,
+    Operators.Sub: VectorizedOperators.Sub,
+    Operators.Mult: VectorizedOperators.Mult,
+    Operators.Div: VectorizedOperators.Div,
+    Operators.Sin: VectorizedOperators.Sin,
+    Operators.Cos: VectorizedOperators.Cos,
+    Operators.Sqrt: VectorizedOperators.Sqrt,
+    Operators.Atan2: VectorizedOperators.Atan2,
+}
+
+
+class ElementwiseOperator:
+    """
+    Fallback for scalar operators without a vectorized counterpart. The scalar operator is applied
+    to one sample at a time, so it is correct but not fast
+    
+    Parameters:
+    - operator:         A scalar operator
+    """
+
+    def __init__(self, operator: Operator) -> None:
+        self.operator = operator
+
+    def __call__(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        x, y = np.broadcast_arrays(x, y)
+        values = (self.operator(float(a), float(b)) for a, b in zip(x.ravel(), y.ravel()))
+        return np.fromiter(values, dtype=float, count=x.size).reshape(x.shape)
+
+
+def vectorize_operators(operations: list[Operator]) -> list[VectorizedOperator]:
+    """
+    Return the vectorized counterpart of every operator in operations
+    """
+    return [VECTORIZED_OPERATORS.get(operator) or ElementwiseOperator(operator) for operator in operations]
+
+
 class Register:
     """
     The register is used for the evaluation of a Chromosome
@@ -80,3 +158,90 @@ def evaluate(chromosome: Chromosome, operations: list[Operator], varReg: list[fl
         register[destinationIndex] = operator(op1, op2)
         
     return register.varReg
+
+
+
+def evaluate_vectorized(chromosome: Chromosome, operations: list[VectorizedOperator], varReg: np.ndarray, constReg: list[float]) -> np.ndarray:
+    """
+    Evaluate a chromosome on all samples at once. The register is a 2-D array with one row per
+    register and one column per sample, so every instruction is a single NumPy operation
+
+    Parameters:
+    - chromosome:       The chromosome to evaluate
+    - operations:       Vectorized operators, see vectorize_operators
+    - varReg:           The variable register with shape (nVar, n_samples)
+    - constReg:         The constant register
+
+    Returns:
+    - varReg:           The variable register after evaluation with shape (nVar, n_samples)
+    """
+    varReg = np.asarray(varReg, dtype=float)
+    nVar, n_samples = varReg.shape
+
+    register = np.empty((nVar + len(constReg), n_samples))
+    register[:nVar] = varReg
+    register[nVar:] = np.asarray(constReg, dtype=float).reshape((-1, 1))
+
+    with np.errstate(all="ignore"):
+        for operandIndex1, operandIndex2, operatorIndex, destinationIndex in chromosome:
+            operator = operations[operatorIndex]
+            register[destinationIndex] = operator(register[operandIndex1], register[operandIndex2])
+
+    return register[:nVar]
+
+
+def pack_population(population: list[Chromosome]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pack a population into one array padded to the length of the longest chromosome
+
+    Returns:
+    - instructions:     Array with shape (population_size, max_length, 4)
+    - lengths:          The length of every chromosome
+    """
+    lengths = np.array([len(chromosome) for chromosome in population], dtype=int)
+    max_length = int(lengths.max()) if len(population) > 0 else 0
+
+    instructions = np.zeros((len(population), max_length, 4), dtype=int)
+    for i, chromosome in enumerate(population):
+        if lengths[i] > 0:
+            instructions[i, :lengths[i]] = chromosome
+    return instructions, lengths
+
+
+def evaluate_population(population: list[Chromosome], operations: list[VectorizedOperator], varReg: np.ndarray, constReg: list[float]) -> np.ndarray:
+    """
+    Evaluate a whole population on all samples at once. All individuals are executed in lock-step.
+    In step k the k-th instruction of every individual is applied, with one NumPy operation per operator
+
+    Parameters:
+    - population:       The chromosomes to evaluate
+    - operations:       Vectorized operators, see vectorize_operators
+    - varReg:           The initial variable register with shape (nVar, n_samples), shared by all individuals
+    - constReg:         The constant register
+
+    Returns:
+    - varReg:           The variable registers after evaluation with shape (population_size, nVar, n_samples)
+    """
+    instructions, lengths = pack_population(population)
+    varReg = np.asarray(varReg, dtype=float)
+    nVar, n_samples = varReg.shape
+
+    register = np.empty((len(population), nVar + len(constReg), n_samples))
+    register[:, :nVar] = varReg
+    register[:, nVar:] = np.asarray(constReg, dtype=float).reshape((-1, 1))
+
+    with np.errstate(all="ignore"):
+        for k in range(instructions.shape[1]):
+            step = instructions[:, k]
+            active = lengths > k
+            for operatorIndex, operator in enumerate(operations):
+                individuals = np.flatnonzero(active & (step[:, 2] == operatorIndex))
+                if individuals.size == 0:
+                    continue
+                operandIndex1, operandIndex2, _, destinationIndex = step[individuals].T
+                register[individuals, destinationIndex] = operator(
+                    register[individuals, operandIndex1],
+                    register[individuals, operandIndex2],
+                )
+
+    return register[:, :nVar]
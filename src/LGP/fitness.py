@@ -1,13 +1,25 @@
 from abc import ABC, abstractmethod
+import time
+import traceback
+import warnings
 import numpy as np
-from multiprocessing import Pool
+from multiprocessing import Pipe, Pool, Process
+from multiprocessing.connection import Connection
+from multiprocessing.pool import Pool as PoolType
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional
 
 from LGP._typing import Chromosome, Operator
-from LGP.evaluation import evaluate
+from LGP.evaluation import evaluate, evaluate_vectorized, evaluate_population, vectorize_operators, ElementwiseOperator
+from LGP.analysis import effective_program, balanced_chunks
+from LGP.data import DataSource, SharedArray
 
 
 class FitnessBase(ABC):
 
+    # False if the fitness is only an estimate, e.g. calculated on a subset of the training data
+    exact: bool = True
+
     @abstractmethod
     def __call__(self, populaiton: list[Chromosome]) -> list[float]:
         """
@@ -20,66 +32,733 @@ class FitnessBase(ABC):
         - fitness: The fitness for every individual in the population
         """
 
+    def exact_fitness(self, individual: Chromosome) -> float:
+        """
+        Calculate the exact fitness of a single individual
+        """
+        return self([individual])[0]
+
+    def close(self) -> None:
+        """
+        Release any resources held by the fitness function
+        """
+
+    def __enter__(self) -> "FitnessBase":
+        return self
 
-class MimicTrainingData(FitnessBase):
+    def __exit__(self, *exc) -> None:
+        self.close()
 
-    def __init__(self, x: np.ndarray, y: np.ndarray, nVar: int, constReg: list[float], operators: list[Operator]) -> None:
+
+class MimicFitnessBase(FitnessBase):
+    """
+    Base class for fitness functions that compare the output registers of a chromosome with training data.
+    The error of a sample is the euclidean distance between the output registers and the output data
+
+    Parameters:
+    - input_len (int):  The number of inputs, stored in the first variable registers
+    - output_len (int): The number of outputs, read from the first variable registers
+    - nVar (int):       The number of variable registers
+    - constReg:         The constant register
+    - operators:        The operators used by the chromosomes
+    - vectorized:       Evaluate every chromosome on all samples at once with NumPy
+    """
+
+    def __init__(self, input_len: int, output_len: int, nVar: int, constReg: list[float], operators: list[Operator], vectorized: bool = False) -> None:
         super().__init__()
+        assert input_len <= nVar
+        assert output_len <= nVar
+
+        self.input_len = input_len
+        self.output_len = output_len
+
+        self.nVar = nVar
+        self.constReg = constReg
+        self.operators = operators
+
+        self.vectorized = vectorized
+        if vectorized:
+            self.vectorized_operators = vectorize_operators(operators)
+
+    def error_sum(self, individual: Chromosome, x: np.ndarray, y: np.ndarray) -> float:
+        """
+        Calculate the sum of the errors of an individual on the samples x and y
+        """
+        # Only the effective program can affect the output registers
+        return self._program_error_sum(self.effective_program(individual), x, y)
+
+    def _program_error_sum(self, program: Chromosome, x: np.ndarray, y: np.ndarray) -> float:
+        if self.vectorized:
+            return self._vectorized_error_sum(program, x, y)
+
+        tot_error = 0
+        for xp, yp in zip(x, y):
+            varReg = [float(xp[i]) if i < self.input_len else 0.0 for i in range(self.nVar)]
+            yh = evaluate(program, self.operators, varReg, self.constReg)[:self.output_len]
+
+            diff = yp - yh
+            error = np.sqrt(np.sum(diff * diff))
+
+            tot_error += error
+        return tot_error
+
+    def effective_program(self, individual: Chromosome) -> Chromosome:
+        """
+        Remove the introns of an individual with respect to the output registers
+        """
+        return effective_program(individual, range(self.output_len), self.operators)
+
+    def cost(self, individual: Chromosome) -> float:
+        """
+        Estimate the relative cost of evaluating an individual. The cost of a sample is one unit per
+        effective instruction plus one unit of overhead
+        """
+        return float(len(self.effective_program(individual)) + 1)
+
+    def _vectorized_error_sum(self, program: Chromosome, x: np.ndarray, y: np.ndarray) -> float:
+        varReg = np.zeros((self.nVar, x.shape[0]))
+        varReg[:self.input_len] = x.T
+        yh = evaluate_vectorized(program, self.vectorized_operators, varReg, self.constReg)[:self.output_len]
+
+        diff = y.T - yh
+        error = np.sqrt(np.sum(diff * diff, axis=0))
+
+        return float(np.sum(error))
+
+
+class MimicTrainingData(MimicFitnessBase):
+    """
+    The fitness is the average euclidean distance between the output of a chromosome and the training data
+
+    Parameters:
+    - x:                Input data with shape (n_samples, input_len)
+    - y:                Output data with shape (n_samples, output_len)
+    - nVar (int):       The number of variable registers
+    - constReg:         The constant register
+    - operators:        The operators used by the chromosomes
+    - vectorized:       Evaluate every chromosome on all samples at once with NumPy
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, nVar: int, constReg: list[float], operators: list[Operator], vectorized: bool = False) -> None:
         assert len(x.shape) == 2
         assert len(y.shape) == 2
 
         assert x.shape[0] == y.shape[0]
 
+        super().__init__(x.shape[1], y.shape[1], nVar, constReg, operators, vectorized)
+
         self.training_samples = x.shape[0]
-        self.input_len = x.shape[1]
-        self.output_len = y.shape[1]
-        assert self.input_len <= nVar
-        assert self.output_len <= nVar
 
         self.x = x
         self.y = y
 
-        self.nVar = nVar
-        self.constReg = constReg
-        self.operators = operators
+        # Cost diagnostics of the last call, recorded if track_cost is True
+        self.track_cost = False
+        self.predicted_cost: list[float] = []
+        self.actual_cost: list[float] = []
+
+    def fitness(self, individual: Chromosome) -> float:
+        """
+        Calculate the fitness of a single individual
+        """
+        return self.error_sum(individual, self.x, self.y) / self.training_samples
+
+    def timed_fitness(self, chunk: list[Chromosome]) -> list[tuple[float, float]]:
+        """
+        Return the fitness and the evaluation time of every individual in a chunk
+        """
+        results = []
+        for individual in chunk:
+            start = time.perf_counter()
+            fitness = self.fitness(individual)
+            results.append((fitness, time.perf_counter() - start))
+        return results
+
+    def _record_cost(self, populaiton: list[Chromosome], seconds: list[float]) -> None:
+        self.predicted_cost = [self.cost(individual) for individual in populaiton]
+        self.actual_cost = seconds
+
+    def seconds_per_cost(self) -> Optional[float]:
+        """
+        The measured time per unit of predicted cost in the last call, if track_cost is True
+        """
+        if not self.actual_cost or sum(self.predicted_cost) == 0:
+            return None
+        return sum(self.actual_cost) / sum(self.predicted_cost)
 
     def __call__(self, populaiton: list[Chromosome]) -> list[float]:
-        
+        if not self.track_cost:
+            return [self.fitness(individual) for individual in populaiton]
+
         fitness = []
+        seconds = []
         for individual in populaiton:
-            tot_error = 0
-            for xp, yp in zip(self.x, self.y):
-                varReg = [float(xp[i]) if i < self.input_len else 0.0 for i in range(self.nVar)]
-                yh = evaluate(individual, self.operators, varReg, self.constReg)[:self.output_len]
+            start = time.perf_counter()
+            fitness.append(self.fitness(individual))
+            seconds.append(time.perf_counter() - start)
+        self._record_cost(populaiton, seconds)
+        return fitness
 
-                diff = yp - yh
-                error = np.sqrt(np.sum(diff * diff))
 
-                tot_error += error
-            
-            fitness.append(tot_error / self.training_samples)
-        
+class MimicTrainingDataStream(MimicFitnessBase):
+    """
+    Same as MimicTrainingData, but the training data is read in chunks from a DataSource, so only
+    one chunk is in memory at a time. Every chunk is read once per generation and the error of the
+    whole population is accumulated incrementally
+
+    Parameters:
+    - source:           The training data, see LGP.data
+    - nVar (int):       The number of variable registers
+    - constReg:         The constant register
+    - operators:        The operators used by the chromosomes
+    - vectorized:       Evaluate every chromosome on a whole chunk at once with NumPy
+    """
+
+    def __init__(self, source: DataSource, nVar: int, constReg: list[float], operators: list[Operator], vectorized: bool = True) -> None:
+        super().__init__(source.input_len, source.output_len, nVar, constReg, operators, vectorized)
+        self.source = source
+
+    def fitness(self, individual: Chromosome) -> float:
+        """
+        Calculate the fitness of a single individual
+        """
+        return self([individual])[0]
+
+    def exact_fitness(self, individual: Chromosome) -> float:
+        return self.fitness(individual)
+
+    def __call__(self, populaiton: list[Chromosome]) -> list[float]:
+        programs = [self.effective_program(individual) for individual in populaiton]
+
+        tot_error = np.zeros(len(programs))
+        training_samples = 0
+        for x, y in self.source.chunks():
+            training_samples += len(x)
+            for i, program in enumerate(programs):
+                tot_error[i] += self._program_error_sum(program, x, y)
+
+        assert training_samples > 0, "The data source is empty"
+        return (tot_error / training_samples).tolist()
+
+
+BatchSchedule = Callable[[int], int]
+
+
+def linear_growth(min_size: int, max_size: int, rate: float, offset: int = 0) -> BatchSchedule:
+    """
+    A batch size that grows linearly from min_size to max_size
+
+    Parameters:
+    - min_size (int):   The initial batch size
+    - max_size (int):   The maximum batch size
+    - rate (float):     The growth measured in samples / generation
+    - offset (int):     Delay the growth until this generation
+
+    Returns:
+    - schedule:         A function that can be called with a generation number to give the corresponding batch size
+    """
+    def _linear_growth(generation: int) -> int:
+        if generation < offset:
+            return min_size
+        return min(max_size, int(min_size + rate * (generation - offset + 1)))
+
+    return _linear_growth
+
+
+class MimicTrainingDataMiniBatch(MimicTrainingData):
+    """
+    Same as MimicTrainingData, but every generation the population is only evaluated on a subset of
+    the training data. The fitness is therefore an estimate and the best individual of every generation
+    is re-scored on the full training data by LGP, see exact_fitness. Do not combine with CachedFitness
+
+    Parameters:
+    - batch_size:       The number of samples in each generation. Either a constant or a function of the generation, e.g. linear_growth
+    - sampling (str):   How to choose the samples:
+                        "random":       A new random subset every generation
+                        "rotating":     Consecutive windows of a fixed random permutation, so every sample is used equally often
+                        "stratified":   One random sample from each of batch_size strata of the output data
+    """
+
+    exact = False
+
+    SAMPLING = ("random", "rotating", "stratified")
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, nVar: int, constReg: list[float], operators: list[Operator], batch_size: int | BatchSchedule, sampling: str = "random", vectorized: bool = True) -> None:
+        super().__init__(x, y, nVar, constReg, operators, vectorized)
+        assert sampling in self.SAMPLING
+
+        self.batch_size = batch_size
+        self.sampling = sampling
+        self.generation = 0
+
+        self._permutation = np.random.permutation(self.training_samples)
+        self._offset = 0
+        # Sort the samples according to the output to create the strata
+        self._sorted = np.lexsort(self.y.T[::-1])
+
+    def samples(self, generation: int) -> np.ndarray:
+        """
+        Return the indices of the samples to use in a generation
+        """
+        size = self.batch_size(generation) if callable(self.batch_size) else self.batch_size
+        size = max(1, min(int(size), self.training_samples))
+
+        if self.sampling == "random":
+            return np.sort(np.random.choice(self.training_samples, size, replace=False))
+
+        if self.sampling == "rotating":
+            indices = self._permutation[(self._offset + np.arange(size)) % self.training_samples]
+            self._offset = (self._offset + size) % self.training_samples
+            return np.sort(indices)
+
+        bounds = np.arange(size + 1) * self.training_samples // size
+        picks = bounds[:-1] + (np.random.random(size) * np.diff(bounds)).astype(int)
+        return np.sort(self._sorted[picks])
+
+    def exact_fitness(self, individual: Chromosome) -> float:
+        return self.fitness(individual)
+
+    def __call__(self, populaiton: list[Chromosome]) -> list[float]:
+        samples = self.samples(self.generation)
+        self.generation += 1
+
+        x = self.x[samples]
+        y = self.y[samples]
+        return [self.error_sum(individual, x, y) / len(samples) for individual in populaiton]
+
+
+class MimicTrainingDataRacing(MimicTrainingData):
+    """
+    Same as MimicTrainingData, but individuals that can not be among the k best are not evaluated on
+    all samples. The samples are evaluated in chunks and since the error of a sample is never negative,
+    the partial error is a lower bound of the fitness. Once it exceeds the threshold, the k-th best fitness
+    of the previous generation, the evaluation stops and the lower bound is returned.
+
+    Every individual with a fitness below the threshold is evaluated exactly, and every aborted individual
+    gets a fitness above the threshold, so the ranking of the promising individuals is correct. The ranking
+    among the aborted individuals is only approximate. Only use with minimize=True.
+
+    The lower bounds are only valid for the current threshold, so they must not be memoized. CachedFitness
+    only caches the individuals of the last call that are not marked in lower_bound
+
+    Parameters:
+    - k (int):              The number of individuals that are guaranteed an exact fitness
+    - chunk_size (int):     The number of samples evaluated between each check of the threshold
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, nVar: int, constReg: list[float], operators: list[Operator], k: int, chunk_size: int = 1000, vectorized: bool = True) -> None:
+        super().__init__(x, y, nVar, constReg, operators, vectorized)
+        assert k > 0
+        assert chunk_size > 0
+
+        self.k = k
+        self.chunk_size = chunk_size
+        self.threshold = np.inf
+
+        # Shuffle the samples so every chunk is representative of the training data
+        permutation = np.random.permutation(self.training_samples)
+        self._chunks = [
+            (self.x[permutation[start:start + chunk_size]], self.y[permutation[start:start + chunk_size]])
+            for start in range(0, self.training_samples, chunk_size)
+        ]
+
+        self.aborted = 0
+        self.evaluated_samples = 0
+        # True for the individuals of the last call whose fitness is a lower bound
+        self.lower_bound: list[bool] = []
+
+    def racing_fitness(self, individual: Chromosome, threshold: float) -> float:
+        """
+        Calculate the fitness of an individual, or a lower bound above threshold if it is worse than threshold
+        """
+        program = self.effective_program(individual)
+
+        tot_error = 0.0
+        for x, y in self._chunks:
+            tot_error += self._program_error_sum(program, x, y)
+            self.evaluated_samples += len(x)
+
+            lower_bound = tot_error / self.training_samples
+            if lower_bound > threshold:
+                self.aborted += 1
+                return lower_bound
+
+        return tot_error / self.training_samples
+
+    def exact_fitness(self, individual: Chromosome) -> float:
+        """
+        Calculate the fitness of an individual on all samples, without aborting or changing the threshold
+        """
+        return self.fitness(individual)
+
+    def __call__(self, populaiton: list[Chromosome]) -> list[float]:
+        self.aborted = 0
+        self.evaluated_samples = 0
+
+        fitness = [self.racing_fitness(individual, self.threshold) for individual in populaiton]
+        self.lower_bound = [f > self.threshold for f in fitness]
+
+        if len(fitness) >= self.k:
+            self.threshold = float(np.partition(fitness, self.k - 1)[self.k - 1])
         return fitness
 
 
+class MimicTrainingDataBatched(MimicTrainingData):
+    """
+    Same as MimicTrainingData, but the whole population is evaluated in lock-step on all samples,
+    see evaluate_population. Individuals are sorted by effective length and evaluated in batches
+    to limit the padding and the size of the register
+
+    Parameters:
+    - batch_size (int):     The maximum number of individuals evaluated together
+    - max_bytes (int):      The maximum size of the register of a batch. Limits the batch size for large training data
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, nVar: int, constReg: list[float], operators: list[Operator], batch_size: int = 500, max_bytes: int = 256 * 2**20) -> None:
+        super().__init__(x, y, nVar, constReg, operators, vectorized=True)
+        assert batch_size > 0
+        assert max_bytes > 0
+
+        # Every individual in a batch needs (nVar + nConst) * n_samples floats
+        individual_bytes = (self.nVar + len(self.constReg)) * self.training_samples * np.dtype(float).itemsize
+        self.batch_size = max(1, min(batch_size, max_bytes // individual_bytes))
+
+        self.varReg = np.zeros((self.nVar, self.training_samples))
+        self.varReg[:self.input_len] = self.x.T
+
+    def __call__(self, populaiton: list[Chromosome]) -> list[float]:
+        programs = [self.effective_program(individual) for individual in populaiton]
+        order = sorted(range(len(programs)), key=lambda i: len(programs[i]))
+
+        fitness = np.empty(len(programs))
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            yh = evaluate_population([programs[i] for i in batch], self.vectorized_operators, self.varReg, self.constReg)[:, :self.output_len]
+
+            diff = self.y.T - yh
+            error = np.sqrt(np.sum(diff * diff, axis=1))
+            fitness[batch] = np.sum(error, axis=1) / self.training_samples
+
+        return fitness.tolist()
+
+
+# The fitness function of a worker process. It is set once when the worker starts.
+# Also used by the workers of scheduler.AsyncEvaluator
+_worker_fitness_func: Optional[FitnessBase] = None
+
+
+def _init_worker(fitness_func: FitnessBase) -> None:
+    global _worker_fitness_func
+    _worker_fitness_func = fitness_func
+
+
+def _worker_call(populaiton: list[Chromosome]) -> list[float]:
+    return _worker_fitness_func(populaiton)
+
+
+def _worker_fitness(individual: Chromosome) -> float:
+    return _worker_fitness_func.fitness(individual)
+
+
+def _worker_fitness_chunk(chunk: list[Chromosome]) -> list[tuple[float, float]]:
+    return _worker_fitness_func.timed_fitness(chunk)
+
+
+def _merge_chunks(chunks: list[list[int]], results: Iterable[list[tuple[float, float]]], n: int) -> tuple[list[float], list[float]]:
+    """
+    Put the (fitness, seconds) results of every chunk back in population order
+    """
+    fitness = [0.0] * n
+    seconds = [0.0] * n
+    for chunk, chunk_results in zip(chunks, results):
+        for i, (f, t) in zip(chunk, chunk_results):
+            fitness[i] = f
+            seconds[i] = t
+    return fitness, seconds
+
+
 class MimicTrainingDataMultiProcessing(MimicTrainingData):
+    """
+    Same as MimicTrainingData, but the population is evaluated by a pool of worker processes.
+    The pool is started on the first call and reused for every generation until close is called.
+    The training data is sent to each worker once, after that only the chromosomes are sent
+
+    By default the population is split into chunks with roughly equal cost, see cost, and the most
+    expensive chunks are sent first. Only the effective programs are sent to the workers
 
-    def __init__(self, x: np.ndarray, y: np.ndarray, nVar: int, constReg: list[float], operators: list[Operator], workers: int = 4) -> None:
-        super().__init__(x, y, nVar, constReg, operators)
+    Parameters:
+    - workers (int):            The number of worker processes
+    - chunksize (int):          The number of chromosomes sent to a worker at a time if balance is False. Chosen by the pool if None
+    - balance (bool):           Split the population into chunks with equal cost. Defaults to True unless chunksize is given
+    - chunks_per_worker (int):  The number of balanced chunks per worker
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, nVar: int, constReg: list[float], operators: list[Operator], workers: int = 4, vectorized: bool = False, chunksize: Optional[int] = None, balance: Optional[bool] = None, chunks_per_worker: int = 4) -> None:
+        super().__init__(x, y, nVar, constReg, operators, vectorized)
+        assert chunks_per_worker > 0
         self.workers = workers
+        self.chunksize = chunksize
+        self.balance = chunksize is None if balance is None else balance
+        self.chunks_per_worker = chunks_per_worker
+        self.pool: Optional[PoolType] = None
 
-    def fitness(self, individual: Chromosome) -> float:
-        tot_error = 0
-        for xp, yp in zip(self.x, self.y):
-            varReg = [float(xp[i]) if i < self.input_len else 0.0 for i in range(self.nVar)]
-            yh = evaluate(individual, self.operators, varReg, self.constReg)[:self.output_len]
+    def _worker_fitness_func(self) -> MimicTrainingData:
+        """
+        The fitness function that is sent to the workers
+        """
+        return MimicTrainingData(self.x, self.y, self.nVar, self.constReg, self.operators, self.vectorized)
 
-            diff = yp - yh
-            error = np.sqrt(np.sum(diff * diff))
+    def _get_pool(self) -> PoolType:
+        if self.pool is None:
+            self.pool = Pool(processes=self.workers, initializer=_init_worker, initargs=(self._worker_fitness_func(),))
+        return self.pool
 
-            tot_error += error
-        return tot_error / self.training_samples
+    def close(self) -> None:
+        """
+        Stop the worker processes
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["pool"] = None
+        return state
 
     def __call__(self, populaiton: list[Chromosome]) -> list[float]:
-        with Pool(processes=self.workers) as pool:
-            return pool.map(self.fitness, populaiton)
+        if not self.balance:
+            return self._get_pool().map(_worker_fitness, populaiton, chunksize=self.chunksize)
+
+        programs = [self.effective_program(individual) for individual in populaiton]
+        chunks = balanced_chunks([self.cost(program) for program in programs], self.workers * self.chunks_per_worker)
+        results = self._get_pool().map(_worker_fitness_chunk, [[programs[i] for i in chunk] for chunk in chunks], chunksize=1)
+        fitness, seconds = _merge_chunks(chunks, results, len(programs))
+
+        if self.track_cost:
+            self._record_cost(programs, seconds)
+        return fitness
+
+
+class MimicTrainingDataSharedMemory(MimicTrainingDataMultiProcessing):
+    """
+    Same as MimicTrainingDataMultiProcessing, but the training data is placed in shared memory once.
+    The workers attach read-only views of it, so the data is neither copied to nor stored in every worker.
+    The shared memory is released by close
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, nVar: int, constReg: list[float], operators: list[Operator], workers: int = 4, vectorized: bool = False, chunksize: Optional[int] = None, balance: Optional[bool] = None, chunks_per_worker: int = 4) -> None:
+        self.shared_x = SharedArray(x)
+        self.shared_y = SharedArray(y)
+        super().__init__(self.shared_x.array, self.shared_y.array, nVar, constReg, operators, workers, vectorized, chunksize, balance, chunks_per_worker)
+
+    def _worker_fitness_func(self) -> MimicTrainingData:
+        # Only the names of the shared memory blocks are pickled
+        return self
+
+    def close(self) -> None:
+        """
+        Stop the worker processes and release the shared memory
+        """
+        super().close()
+        self.x = self.y = None
+        self.shared_x.close()
+        self.shared_y.close()
+
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+        del state["x"]
+        del state["y"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.x = self.shared_x.array
+        self.y = self.shared_y.array
+
+
+class MimicTrainingDataThreaded(MimicTrainingData):
+    """
+    Same as MimicTrainingData, but the population is evaluated by a pool of threads. The threads share
+    the training data and nothing is pickled, so any operator works and the pool starts instantly.
+    The threads only run in parallel while the GIL is released, so this is meant for vectorized
+    evaluation on many samples. Scalar evaluation and operators without a vectorized counterpart,
+    e.g. lambdas, which run through ElementwiseOperator, hold the GIL and give no speedup, so they
+    give a warning. The pool is started on the first call and reused until close is called
+
+    Parameters:
+    - workers (int):            The number of threads
+    - chunksize (int):          The number of chromosomes in a task if balance is False. Chosen from chunks_per_worker if None
+    - balance (bool):           Split the population into chunks with equal cost, see cost. Defaults to True unless chunksize is given
+    - chunks_per_worker (int):  The number of chunks per thread
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, nVar: int, constReg: list[float], operators: list[Operator], workers: int = 4, vectorized: bool = True, chunksize: Optional[int] = None, balance: Optional[bool] = None, chunks_per_worker: int = 4) -> None:
+        super().__init__(x, y, nVar, constReg, operators, vectorized)
+        assert workers > 0
+        assert chunks_per_worker > 0
+        self.workers = workers
+        self.chunksize = chunksize
+        self.balance = chunksize is None if balance is None else balance
+
+        if not vectorized or any(isinstance(op, ElementwiseOperator) for op in self.vectorized_operators):
+            warnings.warn("Scalar operators hold the GIL, so MimicTrainingDataThreaded gives no speedup", RuntimeWarning, stacklevel=2)
+        self.chunks_per_worker = chunks_per_worker
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        return self.executor
+
+    def close(self) -> None:
+        """
+        Stop the threads
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["executor"] = None
+        return state
+
+    def __call__(self, populaiton: list[Chromosome]) -> list[float]:
+        n_chunks = self.workers * self.chunks_per_worker
+        if self.balance:
+            programs = [self.effective_program(individual) for individual in populaiton]
+            chunks = balanced_chunks([self.cost(program) for program in programs], n_chunks)
+        else:
+            programs = populaiton
+            chunksize = self.chunksize or max(1, -(-len(programs) // n_chunks))
+            chunks = [list(range(i, min(i + chunksize, len(programs)))) for i in range(0, len(programs), chunksize)]
+
+        results = self._get_executor().map(self.timed_fitness, [[programs[i] for i in chunk] for chunk in chunks])
+        fitness, seconds = _merge_chunks(chunks, results, len(programs))
+
+        if self.track_cost:
+            self._record_cost(programs, seconds)
+        return fitness
+
+
+def _shard_worker(fitness_func: MimicTrainingData, connection: Connection) -> None:
+    """
+    Hold one shard of the training data and return the error sums of the programs sent to it
+    """
+    try:
+        while True:
+            command, *args = connection.recv()
+
+            if command == "evaluate":
+                programs, = args
+                connection.send(("ok", [fitness_func._program_error_sum(program, fitness_func.x, fitness_func.y) for program in programs]))
+
+            elif command == "stop":
+                return
+    except EOFError:
+        return
+    except Exception:
+        connection.send(("error", traceback.format_exc()))
+
+
+class MimicTrainingDataSharded(MimicTrainingData):
+    """
+    Same as MimicTrainingData, but the rows of the training data are split into shards and every shard is
+    held by its own worker process. Every individual is evaluated on all shards in parallel and the error
+    sums of the shards are added, so even a single individual, e.g. the final validation of the best
+    individual, is evaluated in parallel. The workers are started on the first call and reused until close is called.
+
+    With replicas > 1 there are several groups of shard workers and the population is split between them,
+    which combines data and individual level parallelism. The number of processes is shards * replicas
+
+    Parameters:
+    - shards (int):     The number of shards of the training data
+    - replicas (int):   The number of groups of shard workers that evaluate different individuals
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, nVar: int, constReg: list[float], operators: list[Operator], shards: int = 4, replicas: int = 1, vectorized: bool = True) -> None:
+        super().__init__(x, y, nVar, constReg, operators, vectorized)
+        assert 0 < shards <= self.training_samples
+        assert replicas > 0
+        self.shards = shards
+        self.replicas = replicas
+
+        self.connections: list[list[Connection]] = []
+        self.processes: list[Process] = []
+
+    def _start(self) -> None:
+        if self.processes:
+            return
+        for _ in range(self.replicas):
+            group = []
+            for x, y in zip(np.array_split(self.x, self.shards), np.array_split(self.y, self.shards)):
+                shard = MimicTrainingData(x, y, self.nVar, self.constReg, self.operators, self.vectorized)
+                parent_connection, child_connection = Pipe()
+                process = Process(target=_shard_worker, args=(shard, child_connection), daemon=True)
+                process.start()
+                group.append(parent_connection)
+                self.processes.append(process)
+            self.connections.append(group)
+
+    @staticmethod
+    def _receive(connection: Connection) -> tuple[str, Any]:
+        try:
+            return connection.recv()
+        except (EOFError, OSError):
+            return "error", "The worker stopped unexpectedly"
+
+    def close(self) -> None:
+        """
+        Stop the worker processes
+        """
+        for group in self.connections:
+            for connection in group:
+                try:
+                    connection.send(("stop",))
+                except OSError:
+                    pass
+        for process in self.processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        self.connections = []
+        self.processes = []
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["connections"] = []
+        state["processes"] = []
+        return state
+
+    def fitness(self, individual: Chromosome) -> float:
+        return self([individual])[0]
+
+    def __call__(self, populaiton: list[Chromosome]) -> list[float]:
+        self._start()
+
+        programs = [self.effective_program(individual) for individual in populaiton]
+        chunks = balanced_chunks([self.cost(program) for program in programs], self.replicas)
+        try:
+            for chunk, group in zip(chunks, self.connections):
+                for connection in group:
+                    connection.send(("evaluate", [programs[i] for i in chunk]))
+        except OSError:
+            self.close()
+            raise RuntimeError("Shard worker stopped unexpectedly")
+
+        # Read every reply before raising, so no reply is left for the next call
+        replies = [[self._receive(connection) for connection in group] for group in self.connections[:len(chunks)]]
+        errors = [result for group in replies for status, result in group if status == "error"]
+        if errors:
+            # A failed worker has stopped. The workers are started again on the next call
+            self.close()
+            raise RuntimeError(f"Shard worker failed:\n{errors[0]}")
+
+        fitness = [0.0] * len(programs)
+        for chunk, group in zip(chunks, replies):
+            error_sums = [result for _, result in group]
+            for j, i in enumerate(chunk):
+                fitness[i] = sum(shard[j] for shard in error_sums) / self.training_samples
+        return fitness
@@ -0,0 +1,135 @@
+from typing import Iterable, Iterator, Optional
+import numpy as np
+
+from LGP._typing import Chromosome, Instruction
+
+
+class CompactChromosome:
+    """
+    A chromosome stored as one contiguous array of unsigned integers with four fields per instruction.
+    It behaves like the tuple of instructions it represents: it supports len, iteration, indexing,
+    slicing, concatenation, hashing and comparison with tuples. Slices share memory with the original
+
+    Parameters:
+    - instructions:     The instructions of the chromosome
+    - dtype:            The integer type of the fields. Use np.uint8 if there are less than 256 registers and operators
+    """
+
+    __slots__ = ("data", "_hash")
+
+    def __init__(self, instructions: Iterable[Instruction] = (), dtype: type = np.uint16) -> None:
+        if not isinstance(instructions, np.ndarray):
+            instructions = [tuple(instruction) for instruction in instructions]
+        data = np.array(instructions, dtype=dtype).reshape((-1, 4))
+        data.setflags(write=False)
+        self.data = data
+        self._hash: Optional[int] = None
+
+    @classmethod
+    def _from_array(cls, data: np.ndarray) -> "CompactChromosome":
+        """
+        Wrap an array without copying it
+        """
+        chromosome = cls.__new__(cls)
+        data = data.view()
+        data.setflags(write=False)
+        chromosome.data = data
+        chromosome._hash = None
+        return chromosome
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.data.dtype
+
+    def to_tuple(self) -> Chromosome:
+        """
+        Return the chromosome as a tuple of instructions
+        """
+        return tuple(map(tuple, self.data.tolist()))
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    def __iter__(self) -> Iterator[Instruction]:
+        return map(tuple, self.data.tolist())
+
+    def __reversed__(self) -> Iterator[Instruction]:
+        return map(tuple, self.data[::-1].tolist())
+
+    def __getitem__(self, index: int | slice) -> "Instruction | CompactChromosome":
+        if isinstance(index, slice):
+            return CompactChromosome._from_array(self.data[index])
+        return tuple(self.data[index].tolist())
+
+    def __add__(self, other: Chromosome) -> "CompactChromosome":
+        if not isinstance(other, CompactChromosome):
+            other = CompactChromosome(other, dtype=self.dtype)
+        return CompactChromosome._from_array(np.concatenate((self.data, other.data)).astype(self.dtype, copy=False))
+
+    def __radd__(self, other: Chromosome) -> "CompactChromosome":
+        return CompactChromosome(other, dtype=self.dtype) + self
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompactChromosome):
+            return np.array_equal(self.data, other.data)
+        if isinstance(other, (tuple, list)):
+            return self.to_tuple() == tuple(map(tuple, other))
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # Same hash as the tuple representation, so both can be used as the same key
+        if self._hash is None:
+            self._hash = hash(self.to_tuple())
+        return self._hash
+
+    def __array__(self, dtype: Optional[np.dtype] = None, copy: Optional[bool] = None) -> np.ndarray:
+        return self.data if dtype is None else self.data.astype(dtype)
+
+    def __getstate__(self) -> tuple[str, bytes]:
+        return self.data.dtype.str, self.data.tobytes()
+
+    def __setstate__(self, state: tuple[str, bytes]) -> None:
+        dtype, buffer = state
+        data = np.frombuffer(buffer, dtype=dtype).reshape((-1, 4))
+        self.data = data
+        self._hash = None
+
+    def __repr__(self) -> str:
+        return f"CompactChromosome({self.to_tuple()!r})"
+
+
+def like(chromosome: Chromosome, instructions: Iterable[Instruction]) -> Chromosome:
+    """
+    Create a chromosome from instructions with the same representation as chromosome
+    """
+    if isinstance(chromosome, CompactChromosome):
+        return CompactChromosome(instructions, dtype=chromosome.dtype)
+    return tuple(instructions)
+
+
+def concatenate(population: list[Chromosome]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Concatenate the instructions of a population into one array
+
+    Returns:
+    - instructions:     Array with shape (total_length, 4)
+    - offsets:          Chromosome i is instructions[offsets[i]:offsets[i + 1]]
+    """
+    lengths = np.array([len(chromosome) for chromosome in population], dtype=int)
+    offsets = np.zeros(len(population) + 1, dtype=int)
+    np.cumsum(lengths, out=offsets[1:])
+
+    instructions = np.zeros((offsets[-1], 4), dtype=int)
+    for chromosome, start, stop in zip(population, offsets[:-1], offsets[1:]):
+        if stop > start:
+            instructions[start:stop] = chromosome
+    return instructions, offsets
+
+
+def from_array(chromosome: Chromosome, instructions: np.ndarray) -> Chromosome:
+    """
+    Create a chromosome from an array of instructions with the same representation as chromosome
+    """
+    if isinstance(chromosome, CompactChromosome):
+        return CompactChromosome._from_array(instructions.astype(chromosome.dtype))
+    return tuple(map(tuple, instructions.tolist()))
@@ -0,0 +1,186 @@
+from collections import OrderedDict
+from typing import Iterable, Optional
+import numpy as np
+
+from LGP._typing import Chromosome, Operator, VectorizedOperator
+from LGP.analysis import effective_program
+from LGP.fitness import MimicTrainingData
+
+
+class IncrementalEvaluator:
+    """
+    Evaluate chromosomes on a fixed set of samples and resume from the register state of an earlier
+    chromosome with the same prefix. Offspring of TwoPointCrossover keep the beginning of a parent,
+    and a point mutation leaves every instruction before it unchanged, so most of an offspring can be
+    skipped if the parent has been evaluated.
+
+    A snapshot of the variable registers is saved every interval instructions. A snapshot is identified
+    by the snapshot before it and the instructions in between, so looking up a chromosome is linear
+    in its length. Every snapshot uses nVar * n_samples floats and at most max_bytes are kept.
+    The least recently used snapshots are discarded first.
+
+    The part after the last snapshot is reduced to its effective program if output_registers is given.
+    Introns before it must run, since the snapshots are shared with chromosomes that may read them
+
+    Parameters:
+    - operations:           Vectorized operators, see vectorize_operators
+    - varReg:               The initial variable register with shape (nVar, n_samples)
+    - constReg:             The constant register
+    - interval (int):       The number of instructions between snapshots
+    - max_bytes (int):      The maximum size of the snapshots
+    - output_registers:     The registers that are read after the program has run
+    - operators:            The scalar operators. Used to find the unary operators when removing introns
+    """
+
+    def __init__(
+            self,
+            operations: list[VectorizedOperator],
+            varReg: np.ndarray,
+            constReg: list[float],
+            interval: int = 4,
+            max_bytes: int = 256 * 2**20,
+            output_registers: Optional[Iterable[int]] = None,
+            operators: Optional[list[Operator]] = None,
+    ) -> None:
+        assert interval > 0
+        assert max_bytes > 0
+
+        self.operations = operations
+        self.varReg = np.array(varReg, dtype=float)
+        self.constReg = constReg
+        self.interval = interval
+        self.output_registers = None if output_registers is None else tuple(output_registers)
+        self.operators = operators
+
+        nVar, n_samples = self.varReg.shape
+        self.nVar = nVar
+        self.register = np.empty((nVar + len(constReg), n_samples))
+        self.register[nVar:] = np.asarray(constReg, dtype=float).reshape((-1, 1))
+        self.maxsize = max(1, max_bytes // max(1, self.varReg.nbytes))
+
+        # (previous snapshot, instructions since it) -> (snapshot id, variable registers). The empty prefix has id 0
+        self.snapshots: OrderedDict[tuple[int, Chromosome], tuple[int, np.ndarray]] = OrderedDict()
+        self._next_id = 1
+        self.hits = 0
+        self.misses = 0
+        self.executed = 0
+        self.skipped = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def skipped_fraction(self) -> float:
+        """
+        The fraction of the instructions that were skipped thanks to a snapshot
+        """
+        total = self.executed + self.skipped
+        return self.skipped / total if total else 0.0
+
+    def clear(self) -> None:
+        """
+        Discard all snapshots and reset the counters
+        """
+        self.snapshots.clear()
+        self.hits = 0
+        self.misses = 0
+        self.executed = 0
+        self.skipped = 0
+
+    def _resume_point(self, chromosome: Chromosome) -> tuple[int, int]:
+        """
+        Load the register state of the longest prefix with a snapshot
+
+        Returns:
+        - start:            The length of the prefix
+        - snapshot_id:      The id of the snapshot, 0 if there is none
+        """
+        start = 0
+        snapshot_id = 0
+        snapshot = self.varReg
+        for end in range(self.interval, len(chromosome) + 1, self.interval):
+            key = (snapshot_id, chromosome[end - self.interval:end])
+            entry = self.snapshots.get(key)
+            if entry is None:
+                break
+            self.snapshots.move_to_end(key)
+            snapshot_id, snapshot = entry
+            start = end
+
+        if start:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.register[:self.nVar] = snapshot
+        return start, snapshot_id
+
+    def _store(self, previous_id: int, instructions: Chromosome) -> int:
+        snapshot_id = self._next_id
+        self._next_id += 1
+        self.snapshots[(previous_id, instructions)] = (snapshot_id, self.register[:self.nVar].copy())
+        if len(self.snapshots) > self.maxsize:
+            self.snapshots.popitem(last=False)
+        return snapshot_id
+
+    def _run(self, instructions: Iterable[tuple[int, int, int, int]]) -> None:
+        register = self.register
+        operations = self.operations
+        for operandIndex1, operandIndex2, operatorIndex, destinationIndex in instructions:
+            register[destinationIndex] = operations[operatorIndex](register[operandIndex1], register[operandIndex2])
+            self.executed += 1
+
+    def evaluate(self, chromosome: Chromosome) -> np.ndarray:
+        """
+        Evaluate a chromosome on all samples
+
+        Returns:
+        - varReg:           The variable register after evaluation with shape (nVar, n_samples)
+        """
+        chromosome = tuple(tuple(instruction) for instruction in chromosome)
+
+        start, snapshot_id = self._resume_point(chromosome)
+        self.skipped += start
+        last_snapshot = len(chromosome) // self.interval * self.interval
+
+        with np.errstate(all="ignore"):
+            for end in range(start + self.interval, last_snapshot + 1, self.interval):
+                instructions = chromosome[end - self.interval:end]
+                self._run(instructions)
+                snapshot_id = self._store(snapshot_id, instructions)
+
+            tail = chromosome[last_snapshot:]
+            if self.output_registers is not None:
+                tail = effective_program(tail, self.output_registers, self.operators)
+            self._run(tail)
+
+        return self.register[:self.nVar].copy()
+
+
+class MimicTrainingDataIncremental(MimicTrainingData):
+    """
+    MimicTrainingData that evaluates the chromosomes with an IncrementalEvaluator, so offspring resume
+    from the register state of their parents. Always vectorized
+
+    Parameters:
+    - interval (int):   The number of instructions between snapshots
+    - max_bytes (int):  The maximum size of the snapshots
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, nVar: int, constReg: list[float], operators: list[Operator], interval: int = 4, max_bytes: int = 256 * 2**20) -> None:
+        super().__init__(x, y, nVar, constReg, operators, vectorized=True)
+
+        varReg = np.zeros((nVar, self.training_samples))
+        varReg[:self.input_len] = x.T
+        self.evaluator = IncrementalEvaluator(
+            self.vectorized_operators, varReg, constReg, interval, max_bytes, range(self.output_len), operators
+        )
+
+    def fitness(self, individual: Chromosome) -> float:
+        yh = self.evaluator.evaluate(individual)[:self.output_len]
+
+        diff = self.y.T - yh
+        error = np.sqrt(np.sum(diff * diff, axis=0))
+
+        return float(np.sum(error)) / self.training_samples
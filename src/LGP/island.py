@@ -0,0 +1,213 @@
+import math
+import random
+import traceback
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from typing import Callable, Optional
+import numpy as np
+from tqdm import trange
+
+from LGP._typing import Chromosome
+from LGP.LGP import LGP
+
+
+LGPFactory = Callable[[int], LGP]
+Topology = Callable[[int], list[int]]
+Migrants = list[tuple[Chromosome, float]]
+
+
+# Migration topologies. Given the number of islands, return the destination of the migrants from every island
+def ring_topology(n_islands: int) -> list[int]:
+    """
+    Island i sends its migrants to island i + 1
+    """
+    return [(i + 1) % n_islands for i in range(n_islands)]
+
+
+def random_topology(n_islands: int) -> list[int]:
+    """
+    Every island sends its migrants to another random island
+    """
+    if n_islands < 2:
+        return list(range(n_islands))
+    return [random.choice([j for j in range(n_islands) if j != i]) for i in range(n_islands)]
+
+
+def _top(lgp: LGP, m: int) -> Migrants:
+    """
+    Return the m best individuals of the last evaluated generation together with their fitness
+    """
+    order = np.argsort(lgp.last_fitness)
+    if not lgp.minimize:
+        order = order[::-1]
+    return [(lgp.last_population[i], lgp.last_fitness[i]) for i in order[:m]]
+
+
+def _replace_random(lgp: LGP, immigrants: Migrants) -> None:
+    """
+    Replace random individuals of the population with the immigrants. The population has not been
+    evaluated yet, so the worst individuals are not known
+    """
+    positions = np.random.choice(len(lgp.population), size=min(len(immigrants), len(lgp.population)), replace=False)
+    for i, (chromosome, _) in zip(positions, immigrants):
+        lgp.population[i] = chromosome
+
+
+def _island_worker(index: int, factory: LGPFactory, seed: int, connection: Connection) -> None:
+    """
+    Run one island. The island waits for commands from the IslandLGP driver
+    """
+    try:
+        random.seed(seed)
+        np.random.seed(seed % 2**32)
+        lgp = factory(index)
+
+        while True:
+            command, *args = connection.recv()
+
+            if command == "evolve":
+                immigrants, generations, n_migrants = args
+                if immigrants:
+                    _replace_random(lgp, immigrants)
+
+                # The migrants come from the last generation of the run, so nothing is evaluated twice
+                lgp.run(generations, progress=False)
+
+                connection.send(("ok", _top(lgp, n_migrants), lgp.all_time_best_individual, lgp.all_time_best_fitness, lgp.minimize))
+
+            elif command == "stop":
+                lgp.fitness_func.close()
+                connection.send(("ok", lgp.best_fitness_log, lgp.avg_fitness_log))
+                return
+    except Exception:
+        connection.send(("error", traceback.format_exc()))
+
+
+class IslandLGP:
+    """
+    Run several LGP instances in parallel, each in its own process, with periodic migration
+    of the best individuals between the islands. Only the migrants and their fitness are sent
+    between the processes. The migrants are the best individuals of the last generation of an island
+    and replace random individuals in the next population of the receiving island
+
+    Parameters:
+    - factory:              Called with the index of an island in the worker process. Returns the LGP of that island
+    - n_islands (int):      The number of islands
+    - migration_interval:   The number of generations between migrations
+    - n_migrants (int):     The number of individuals each island sends at every migration
+    - topology:             The migration topology, for example ring_topology or random_topology
+    - seed:                 Island i is seeded with seed + i. Random if None
+    """
+
+    def __init__(
+            self,
+            factory: LGPFactory,
+            n_islands: int,
+            migration_interval: int = 10,
+            n_migrants: int = 1,
+            topology: Topology = ring_topology,
+            seed: Optional[int] = None,
+    ) -> None:
+        assert n_islands > 0
+        assert migration_interval > 0
+        assert n_migrants >= 0
+
+        self.factory = factory
+        self.n_islands = n_islands
+        self.migration_interval = migration_interval
+        self.n_migrants = n_migrants
+        self.topology = topology
+        self.seed = seed if seed is not None else random.randrange(2**32)
+
+        self.minimize: Optional[bool] = None
+        self.all_time_best_fitness: Optional[float] = None
+        self.all_time_best_individual: Chromosome = tuple()
+
+        self.island_best_fitness: list[Optional[float]] = [None] * n_islands
+        self.best_fitness_logs: list[list[float]] = []
+        self.avg_fitness_logs: list[list[float]] = []
+
+    @classmethod
+    def _send(cls, connection: Connection, message: tuple, island: int) -> None:
+        try:
+            connection.send(message)
+        except OSError:
+            # The island has stopped. Report its error if it sent one
+            if connection.poll():
+                cls._receive(connection, island)
+            raise RuntimeError(f"Island {island} stopped unexpectedly")
+
+    @staticmethod
+    def _receive(connection: Connection, island: int) -> tuple:
+        try:
+            status, *result = connection.recv()
+        except (EOFError, OSError):
+            raise RuntimeError(f"Island {island} stopped unexpectedly")
+        if status == "error":
+            raise RuntimeError(f"Island {island} failed:\n{result[0]}")
+        return result
+
+    def _update_best(self, island: int, individual: Chromosome, fitness: float, minimize: bool) -> None:
+        self.minimize = minimize
+        self.island_best_fitness[island] = fitness
+
+        if self.all_time_best_fitness is None:
+            better = True
+        else:
+            better = fitness < self.all_time_best_fitness if minimize else fitness > self.all_time_best_fitness
+
+        if better:
+            self.all_time_best_fitness = fitness
+            self.all_time_best_individual = individual
+
+    def run(self, generations: int) -> Chromosome:
+        connections = []
+        processes = []
+        try:
+            for i in range(self.n_islands):
+                parent_connection, child_connection = Pipe()
+                # Not a daemon, so the fitness function of an island may start its own worker processes
+                process = Process(target=_island_worker, args=(i, self.factory, self.seed + i, child_connection))
+                process.start()
+                # Only the island holds the other end, so recv fails instead of blocking if the island dies
+                child_connection.close()
+                connections.append(parent_connection)
+                processes.append(process)
+
+            immigrants: list[Migrants] = [[] for _ in range(self.n_islands)]
+            epochs = math.ceil(generations / self.migration_interval)
+            pbar = trange(epochs, desc="Best fitness: ???")
+
+            for epoch in pbar:
+                epoch_generations = min(self.migration_interval, generations - epoch * self.migration_interval)
+                for i, (connection, migrants) in enumerate(zip(connections, immigrants)):
+                    self._send(connection, ("evolve", migrants, epoch_generations, self.n_migrants), i)
+
+                emigrants = []
+                for i, connection in enumerate(connections):
+                    migrants, best_individual, best_fitness, minimize = self._receive(connection, i)
+                    self._update_best(i, best_individual, best_fitness, minimize)
+                    emigrants.append(migrants)
+
+                pbar.desc = f"Best fitness: {self.all_time_best_fitness:0.2f}"
+
+                # Send the migrants according to the topology
+                immigrants = [[] for _ in range(self.n_islands)]
+                for source, destination in enumerate(self.topology(self.n_islands)):
+                    if destination != source:
+                        immigrants[destination].extend(emigrants[source])
+
+            self.best_fitness_logs = []
+            self.avg_fitness_logs = []
+            for i, connection in enumerate(connections):
+                self._send(connection, ("stop",), i)
+                best_fitness_log, avg_fitness_log = self._receive(connection, i)
+                self.best_fitness_logs.append(best_fitness_log)
+                self.avg_fitness_logs.append(avg_fitness_log)
+        finally:
+            for process in processes:
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+
+        return self.all_time_best_individual
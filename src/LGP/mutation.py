@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
 import random
 from typing import Callable, Optional
+import numpy as np
 
 from LGP._typing import Chromosome, Instruction
 from LGP.population import random_instruction
+from LGP.genome import like, concatenate, from_array
 
 
 DecayFunction = Callable[[int], float]
@@ -62,6 +64,29 @@ class MutationBase(ABC):
         - chromosome: A new and mutated chromosome
         """
 
+    def mutate_population(self, population: list[Chromosome]) -> list[Chromosome]:
+        """
+        Mutate every chromosome in a population
+
+        Parameters:
+        - population: A list of chromosomes
+
+        Returns:
+        - population: The new and mutated chromosomes
+        """
+        return [self.mutate(chromosome) for chromosome in population]
+
+    def _random_instructions(self, n: int) -> np.ndarray:
+        """
+        Return n random instructions as an array with shape (n, 4)
+        """
+        return np.stack((
+            np.random.randint(0, self.nTot, n),
+            np.random.randint(0, self.nTot, n),
+            np.random.randint(0, self.nOp, n),
+            np.random.randint(0, self.nVar, n),
+        ), axis=1)
+
     def update(self, generation: int) -> None:
         """
         Update the mutation depending on the generation number
@@ -95,7 +120,23 @@ class InstructionMutation(MutationBase):
             else:
                 return intruction[0], intruction[1], intruction[2], random.randint(0, self.nVar - 1)
             
-        return tuple(_mutate_intruction(instruction) if random.random() < self.pMutate else instruction for instruction in chromosome)
+        return like(chromosome, (_mutate_intruction(instruction) if random.random() < self.pMutate else instruction for instruction in chromosome))
+
+    def mutate_population(self, population: list[Chromosome]) -> list[Chromosome]:
+        instructions, offsets = concatenate(population)
+
+        # Draw which instructions to mutate and which field to replace for the whole population at once
+        rows = np.flatnonzero(np.random.random(len(instructions)) < self.pMutate)
+        fields = np.random.randint(0, 4, rows.size)
+        upper = np.array([self.nTot, self.nTot, self.nOp, self.nVar])[fields]
+        instructions[rows, fields] = np.random.randint(0, upper)
+
+        # Only rebuild the chromosomes that were mutated
+        mutated = np.bincount(np.searchsorted(offsets, rows, side="right") - 1, minlength=len(population)) > 0
+        return [
+            from_array(chromosome, instructions[start:stop]) if mutated[i] else chromosome
+            for i, (chromosome, start, stop) in enumerate(zip(population, offsets[:-1], offsets[1:]))
+        ]
 
 
 class InsertMutation(MutationBase):
@@ -118,7 +159,32 @@ class InsertMutation(MutationBase):
         if random.random() < self.pMutate:
             new_chromosome.append(random_instruction(self.nVar, self.nConst, self.nOp))
         
-        return tuple(new_chromosome)
+        return like(chromosome, new_chromosome)
+
+    def mutate_population(self, population: list[Chromosome]) -> list[Chromosome]:
+        instructions, offsets = concatenate(population)
+        lengths = np.diff(offsets)
+        if self.max_len is not None:
+            lengths = np.where(lengths > self.max_len, -1, lengths)
+
+        # There is one insertion point before every instruction and one at the end
+        slots = np.zeros(len(population) + 1, dtype=int)
+        np.cumsum(lengths + 1, out=slots[1:])
+        insert = np.random.random(slots[-1]) < self.pMutate
+        new_instructions = self._random_instructions(int(np.count_nonzero(insert)))
+
+        new_population = []
+        n_inserted = 0
+        for i, chromosome in enumerate(population):
+            positions = np.flatnonzero(insert[slots[i]:slots[i + 1]])
+            if positions.size == 0:
+                new_population.append(chromosome)
+                continue
+            values = new_instructions[n_inserted:n_inserted + positions.size]
+            n_inserted += positions.size
+            new_population.append(from_array(chromosome, np.insert(instructions[offsets[i]:offsets[i + 1]], positions, values, axis=0)))
+
+        return new_population
 
 
 class DeleteMutation(MutationBase):
@@ -137,4 +203,18 @@ class DeleteMutation(MutationBase):
                 continue
             new_chromosome.append(instruction)
 
-        return tuple(new_chromosome)
+        return like(chromosome, new_chromosome)
+
+    def mutate_population(self, population: list[Chromosome]) -> list[Chromosome]:
+        instructions, offsets = concatenate(population)
+        keep = np.random.random(len(instructions)) >= self.pMutate
+
+        new_population = []
+        for chromosome, start, stop in zip(population, offsets[:-1], offsets[1:]):
+            chromosome_keep = keep[start:stop]
+            if chromosome_keep.all() or (self.min_len is not None and len(chromosome) < self.min_len):
+                new_population.append(chromosome)
+            else:
+                new_population.append(from_array(chromosome, instructions[start:stop][chromosome_keep]))
+
+        return new_population
@@ -1,6 +1,7 @@
 import random
 
 from LGP._typing import Chromosome, Instruction
+from LGP.genome import CompactChromosome
 
 
 def random_instruction(nVar: int, nConst: int, nOp: int) -> Instruction:
@@ -18,11 +19,14 @@ def random_individual(size: int, nVar: int, nConst: int, nOp: int) -> Chromosome
     return tuple(random_instruction(nVar, nConst, nOp) for _ in range(size))
 
 
-def random_population(population_size: int, min_size: int, max_size: int, nVar: int, nConst: int, nOp: int) -> list[Chromosome]:
+def random_population(population_size: int, min_size: int, max_size: int, nVar: int, nConst: int, nOp: int, compact: bool = False) -> list[Chromosome]:
     """
-    Return a random population
+    Return a random population. If compact is True the chromosomes are CompactChromosomes
     """
-    return [
+    population = [
         random_individual(random.randint(min_size, max_size), nVar, nConst, nOp)
         for _ in range(population_size)
     ]
+    if compact:
+        population = [CompactChromosome(chromosome) for chromosome in population]
+    return population
@@ -0,0 +1,130 @@
+from contextlib import contextmanager, nullcontext
+import time
+from typing import Any, Callable, Iterator, Optional
+import numpy as np
+
+from LGP._typing import Chromosome
+from LGP.fitness import FitnessBase
+
+
+GenerationRecord = dict[str, Any]
+
+
+def _fitness_attribute(fitness_func: FitnessBase, name: str) -> Any:
+    """
+    Get an attribute from a fitness function or from the fitness functions it wraps
+    """
+    while fitness_func is not None:
+        if hasattr(fitness_func, name):
+            return getattr(fitness_func, name)
+        fitness_func = getattr(fitness_func, "fitness_func", None)
+    return None
+
+
+class NullProfiler:
+    """
+    A profiler that does nothing. Used when profiling is turned off
+    """
+
+    _context = nullcontext()
+
+    def phase(self, name: str) -> nullcontext:
+        return self._context
+
+    def start_generation(self) -> None:
+        pass
+
+    def end_generation(self, generation: int, population: list[Chromosome], evaluated: int, fitness_func: FitnessBase) -> None:
+        pass
+
+
+class Profiler(NullProfiler):
+    """
+    Measure the wall and CPU time of every phase of a generation. One record is created per generation with:
+    - generation:                   The generation number
+    - <phase>_wall, <phase>_cpu:    The time spent in each phase, e.g. fitness, selection, crossover, mutation, log and callbacks
+    - wall, cpu:                    The time of the whole generation
+    - evaluations:                  The number of evaluated individuals
+    - evaluations_per_second:       Evaluated individuals per second of fitness wall time
+    - avg_length:                   The average length of the evaluated chromosomes
+    - avg_effective_length:         The average length of the effective programs, if the fitness function can tell
+    - instructions_per_second:      Executed effective instructions per second of fitness wall time, if the number of samples is known.
+                                    Cache hits are assumed to be as long as the average individual
+    - cache_hit_rate:               The hit rate of a CachedFitness during the generation
+
+    Parameters:
+    - callback:         Called with every new record
+    """
+
+    def __init__(self, callback: Optional[Callable[[GenerationRecord], None]] = None) -> None:
+        self.callback = callback
+        self.records: list[GenerationRecord] = []
+
+        self._current: GenerationRecord = {}
+        self._start_wall = 0.0
+        self._start_cpu = 0.0
+        self._cache_counters = (0, 0)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            self._current[f"{name}_wall"] = self._current.get(f"{name}_wall", 0.0) + time.perf_counter() - start_wall
+            self._current[f"{name}_cpu"] = self._current.get(f"{name}_cpu", 0.0) + time.process_time() - start_cpu
+
+    def start_generation(self) -> None:
+        self._current = {}
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+
+    def end_generation(self, generation: int, population: list[Chromosome], evaluated: int, fitness_func: FitnessBase) -> None:
+        """
+        Finish the record of a generation
+
+        Parameters:
+        - generation:       The generation number
+        - population:       The evaluated chromosomes
+        - evaluated:        The number of evaluated individuals
+        - fitness_func:     The fitness function, used for the effective length, number of samples and cache statistics
+        """
+        record = {
+            "generation": generation,
+            "wall": time.perf_counter() - self._start_wall,
+            "cpu": time.process_time() - self._start_cpu,
+            **self._current,
+            "evaluations": evaluated,
+        }
+
+        fitness_wall = record.get("fitness_wall", 0.0)
+        record["evaluations_per_second"] = evaluated / fitness_wall if fitness_wall > 0 else None
+        record["avg_length"] = float(np.mean([len(c) for c in population])) if population else 0.0
+
+        hits = _fitness_attribute(fitness_func, "hits")
+        misses = _fitness_attribute(fitness_func, "misses")
+        record["cache_hit_rate"] = None
+        if hits is not None and misses is not None:
+            new_hits = hits - self._cache_counters[0]
+            new_misses = misses - self._cache_counters[1]
+            self._cache_counters = (hits, misses)
+            if new_hits + new_misses > 0:
+                record["cache_hit_rate"] = new_hits / (new_hits + new_misses)
+
+        effective_program = _fitness_attribute(fitness_func, "effective_program")
+        record["avg_effective_length"] = None
+        record["instructions_per_second"] = None
+        if effective_program is not None and population:
+            effective_lengths = [len(effective_program(c)) for c in population]
+            record["avg_effective_length"] = float(np.mean(effective_lengths))
+
+            samples = _fitness_attribute(fitness_func, "training_samples")
+            if samples is not None and fitness_wall > 0:
+                # Cache hits are not executed
+                executed = 1.0 - (record["cache_hit_rate"] or 0.0)
+                record["instructions_per_second"] = executed * sum(effective_lengths) * samples / fitness_wall
+
+        self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
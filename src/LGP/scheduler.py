@@ -0,0 +1,96 @@
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Iterator, Optional
+
+from LGP._typing import Chromosome
+from LGP.analysis import balanced_chunks
+from LGP.fitness import FitnessBase, _init_worker, _worker_call
+
+
+def _evaluate_chunk(indices: list[int], chromosomes: list[Chromosome]) -> list[tuple[int, float]]:
+    return list(zip(indices, _worker_call(chromosomes)))
+
+
+class AsyncEvaluator(FitnessBase):
+    """
+    Evaluate individuals asynchronously in a pool of worker processes. The individuals are sorted by
+    their estimated cost, e.g. MimicFitnessBase.cost, and packed into chunks with roughly equal cost,
+    the most expensive chunks first. Results can be collected as they complete, e.g. by
+    SteadyStateLGP.run_async, or all at once by calling the evaluator like any fitness function
+
+    Parameters:
+    - fitness_func:             The fitness function. It is sent to every worker once
+    - workers (int):            The number of worker processes
+    - chunks_per_worker (int):  The number of chunks per worker a population is split into
+    """
+
+    def __init__(self, fitness_func: FitnessBase, workers: int = 4, chunks_per_worker: int = 4) -> None:
+        super().__init__()
+        assert workers > 0
+        assert chunks_per_worker > 0
+
+        self.fitness_func = fitness_func
+        self.workers = workers
+        self.chunks_per_worker = chunks_per_worker
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.fitness_func,))
+        return self.executor
+
+    def cost(self, individual: Chromosome) -> float:
+        """
+        Estimate the cost of evaluating an individual. Uses the cost model of the fitness function if it has one
+        """
+        cost = getattr(self.fitness_func, "cost", None)
+        if cost is not None:
+            return cost(individual)
+        return len(individual) + 1
+
+    def submit(self, populaiton: list[Chromosome], n_chunks: Optional[int] = None) -> list[Future]:
+        """
+        Submit a population for evaluation
+
+        Parameters:
+        - population:       The individuals to evaluate
+        - n_chunks (int):   The number of chunks. Defaults to chunks_per_worker chunks per worker
+
+        Returns:
+        - futures:          One future per chunk. Each gives a list of (index in population, fitness)
+        """
+        if n_chunks is None:
+            n_chunks = self.workers * self.chunks_per_worker
+
+        executor = self._get_executor()
+        costs = [self.cost(individual) for individual in populaiton]
+        return [
+            executor.submit(_evaluate_chunk, chunk, [populaiton[i] for i in chunk])
+            for chunk in balanced_chunks(costs, n_chunks)
+        ]
+
+    def as_completed(self, populaiton: list[Chromosome]) -> Iterator[tuple[int, float]]:
+        """
+        Evaluate a population and yield (index, fitness) as the results complete
+        """
+        for future in as_completed(self.submit(populaiton)):
+            yield from future.result()
+
+    def __call__(self, populaiton: list[Chromosome]) -> list[float]:
+        fitness = [0.0] * len(populaiton)
+        for index, f in self.as_completed(populaiton):
+            fitness[index] = f
+        return fitness
+
+    def close(self) -> None:
+        """
+        Stop the worker processes and close the wrapped fitness function
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        self.fitness_func.close()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["executor"] = None
+        return state
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 import random
+import numpy as np
 
 
 class SelectionBase(ABC):
@@ -19,6 +20,19 @@ class SelectionBase(ABC):
         - winner (int):             The winner of the selection
         """
 
+    def select_many(self, fitness: list[float], n: int) -> np.ndarray:
+        """
+        Select n individuals and return their indices
+
+        Parameters:
+        - fitness (list[float]):    The fitness for each individual in the populaiton
+        - n (int):                  The number of individuals to select
+
+        Returns:
+        - winners (np.ndarray):     The winners of the selections
+        """
+        return np.array([self.select(fitness) for _ in range(n)], dtype=int)
+
 
 class TournamentSelection(SelectionBase):
     """
@@ -55,3 +69,19 @@ class TournamentSelection(SelectionBase):
         
         # Return the worst individual with probability (1 - pTour)^size
         return tournament_indecies[0]
+
+    def select_many(self, fitness: list[float], n: int) -> np.ndarray:
+        fitness = np.asarray(fitness, dtype=float)
+
+        # Draw all tournaments at once and sort them according to fitness (best first)
+        tournaments = np.random.randint(0, len(fitness), (n, self.size))
+        order = np.argsort(fitness[tournaments], axis=1, kind="stable")[:, ::-1]
+        tournaments = np.take_along_axis(tournaments, order, axis=1)
+
+        # The winner is the first individual that wins its draw with probability pTour,
+        # or the worst individual if all the draws are lost
+        draws = np.random.random((n, self.size - 1)) < self.pTour
+        draws = np.hstack((draws, np.ones((n, 1), dtype=bool)))
+        winner = draws.argmax(axis=1)
+
+        return tournaments[np.arange(n), winner]
@@ -0,0 +1,214 @@
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+import random
+from typing import Optional
+import numpy as np
+from tqdm import tqdm, trange
+
+from LGP._typing import Chromosome
+from LGP.LGP import LGP
+from LGP.selection import SelectionBase
+from LGP.crossover import CrossoverBase
+from LGP.mutation import MutationBase
+from LGP.fitness import FitnessBase
+from LGP.scheduler import AsyncEvaluator
+
+
+class SteadyStateLGP(LGP):
+    """
+    Steady-state variant of LGP. The fitness of the population is kept between steps. Every step
+    creates a few offspring with the selection, crossover and mutation methods, evaluates only the
+    offspring and lets each of them replace the loser of a tournament in the population
+
+    Parameters:
+    - offspring_per_step (int):     The number of offspring created and evaluated in every step
+    - replacement_size (int):       The number of individuals in the tournament deciding who is replaced. The worst is replaced
+    - elitism (bool):               Never replace the best individual in the population
+
+    See LGP for the other parameters
+    """
+
+    def __init__(
+            self,
+            population: list[Chromosome],
+            selection_method: SelectionBase,
+            crossover_method: CrossoverBase,
+            mutation_method: MutationBase | list[MutationBase],
+            fitness_func: FitnessBase,
+            minimize: bool = False,
+            elitism: bool = False,
+            len_punishment: float = 0.0,
+            offspring_per_step: int = 2,
+            replacement_size: int = 2,
+    ) -> None:
+        super().__init__(population, selection_method, crossover_method, mutation_method, fitness_func, minimize, elitism, len_punishment)
+        assert offspring_per_step > 0
+        assert replacement_size > 0
+
+        self.offspring_per_step = offspring_per_step
+        self.replacement_size = replacement_size
+
+        self.fitness: Optional[list[float]] = None
+        self.evaluations = 0
+
+    def _checkpoint_state(self) -> dict:
+        state = super()._checkpoint_state()
+        state["fitness"] = np.array([] if self.fitness is None else self.fitness, dtype=float)
+        state["has_fitness"] = self.fitness is not None
+        state["evaluations"] = self.evaluations
+        return state
+
+    def _restore_state(self, state: dict) -> None:
+        super()._restore_state(state)
+        self.fitness = state["fitness"].tolist() if state["has_fitness"] else None
+        self.evaluations = int(state["evaluations"])
+
+    def _evaluate(self, chromosomes: list[Chromosome]) -> list[float]:
+        self.evaluations += len(chromosomes)
+        return list(self.fitness_func(chromosomes))
+
+    def _selection_fitness(self) -> np.ndarray:
+        """
+        The fitness used for selection and replacement, larger is better
+        """
+        fitness = np.asarray(self.fitness, dtype=float)
+        if self.minimize:
+            fitness = -fitness
+        lengths = np.array([len(chromosome) for chromosome in self.population])
+        return fitness - self.len_punishment * lengths
+
+    def _offspring(self, n: int) -> list[Chromosome]:
+        """
+        Create n offspring from the current population
+        """
+        with self.profiler.phase("selection"):
+            parents = self.selection_method.select_many(self._selection_fitness().tolist(), n + n % 2)
+
+        offspring = []
+        with self.profiler.phase("crossover"):
+            for parent1_index, parent2_index in zip(parents[::2], parents[1::2]):
+                offspring.extend(self.crossover_method.crossover(self.population[parent1_index], self.population[parent2_index]))
+
+        with self.profiler.phase("mutation"):
+            for mutation in self.mutation_method:
+                offspring = mutation.mutate_population(offspring)
+
+        return offspring[:n]
+
+    def _replace(self, individual: Chromosome, fitness: float, selection_fitness: np.ndarray) -> None:
+        """
+        Insert an individual in the population in place of the loser of a tournament
+        """
+        contestants = [random.randrange(self.population_size) for _ in range(self.replacement_size)]
+        loser = min(contestants, key=lambda i: selection_fitness[i])
+
+        # Never replace the best individual
+        if self.elitism and loser == int(np.argmax(selection_fitness)):
+            return
+
+        self.population[loser] = individual
+        self.fitness[loser] = fitness
+        selection_fitness[loser] = (-fitness if self.minimize else fitness) - self.len_punishment * len(individual)
+
+    def initialize(self) -> None:
+        """
+        Evaluate the initial population
+        """
+        self.population_size = len(self.population)
+        self.fitness = self._evaluate(self.population)
+        self._log(self.fitness)
+
+    def step(self) -> list[Chromosome]:
+        """
+        Create, evaluate and insert one batch of offspring. Returns the offspring
+        """
+        offspring = self._offspring(self.offspring_per_step)
+        with self.profiler.phase("fitness"):
+            offspring_fitness = self._evaluate(offspring)
+
+        with self.profiler.phase("replacement"):
+            selection_fitness = self._selection_fitness()
+            for individual, fitness in zip(offspring, offspring_fitness):
+                self._replace(individual, fitness, selection_fitness)
+
+        with self.profiler.phase("log"):
+            self._log(self.fitness)
+        return offspring
+
+    def run(self, steps: int, progress: bool = True) -> Chromosome:
+        if self.fitness is None or len(self.fitness) != len(self.population):
+            self.initialize()
+
+        pbar = trange(steps, desc="Best fitness: ???", disable=not progress)
+
+        for _ in pbar:
+            self.profiler.start_generation()
+            offspring = self.step()
+            self.generation += 1
+            pbar.desc = f"Best fitness: {self.all_time_best_fitness:0.2f}"
+
+            with self.profiler.phase("callbacks"):
+                for callback in self.generation_callback:
+                    callback(self)
+
+            with self.profiler.phase("checkpoint"):
+                self._maybe_checkpoint()
+
+            self.profiler.end_generation(self.generation - 1, offspring, len(offspring), self.fitness_func)
+
+        return self.all_time_best_individual
+
+    def run_async(self, evaluations: int, evaluator: AsyncEvaluator, in_flight: Optional[int] = None, progress: bool = True) -> Chromosome:
+        """
+        Run until evaluations offspring have been evaluated. The offspring are evaluated asynchronously
+        by the evaluator and inserted in the population as soon as their fitness is known, so the
+        workers never wait for each other
+
+        Parameters:
+        - evaluations (int):    The number of offspring to evaluate
+        - evaluator:            The asynchronous evaluator
+        - in_flight (int):      The number of offspring batches being evaluated at the same time. Defaults to twice the number of workers
+        """
+        if in_flight is None:
+            in_flight = 2 * evaluator.workers
+
+        if self.fitness is None or len(self.fitness) != len(self.population):
+            self.population_size = len(self.population)
+            self.evaluations += len(self.population)
+            self.fitness = evaluator(self.population)
+            self._log(self.fitness)
+
+        pbar = tqdm(total=evaluations, desc="Best fitness: ???", disable=not progress)
+        pending: dict[Future, list[Chromosome]] = {}
+        submitted = 0
+
+        def submit() -> None:
+            nonlocal submitted
+            offspring = self._offspring(min(self.offspring_per_step, evaluations - submitted))
+            submitted += len(offspring)
+            future, = evaluator.submit(offspring, n_chunks=1)
+            pending[future] = offspring
+
+        while submitted < evaluations and len(pending) < in_flight:
+            submit()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                offspring = pending.pop(future)
+                selection_fitness = self._selection_fitness()
+                for index, fitness in future.result():
+                    self._replace(offspring[index], fitness, selection_fitness)
+                self.evaluations += len(offspring)
+                self._log(self.fitness)
+
+                pbar.update(len(offspring))
+                pbar.desc = f"Best fitness: {self.all_time_best_fitness:0.2f}"
+
+                for callback in self.generation_callback:
+                    callback(self)
+
+                if submitted < evaluations:
+                    submit()
+
+        pbar.close()
+        return self.all_time_best_individual
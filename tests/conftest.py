@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from LGP.LGP import LGP
+from LGP.fitness import MimicTrainingData
+from LGP.selection import TournamentSelection
+from LGP.crossover import TwoPointCrossover
+from LGP.mutation import InstructionMutation
+from LGP.evaluation import Operators
+from LGP.population import random_population
+
+
+@pytest.fixture
+def operators():
+    return [Operators.Add, Operators.Sub, Operators.Mult]
+
+
+@pytest.fixture
+def training_data():
+    """
+    Return a function that samples y = x^3 + 4x^2 - 10x - 7 at n_samples points in [-5, 5]
+    """
+    def sample(n_samples=20):
+        x = np.linspace(-5, 5, n_samples).reshape((-1, 1))
+        y = np.polyval([1, 4, -10, -7], x)
+        return x, y
+
+    return sample
+
+
+@pytest.fixture
+def make_lgp(operators, training_data):
+    """
+    Return a function that creates an LGP with 4 variable and 3 constant registers. The fitness defaults
+    to MimicTrainingData on 20 samples of training_data. Keyword arguments override the other defaults
+    """
+    def make(population=None, fitness_func=None, lgp_class=LGP, **kwargs):
+        if population is None:
+            population = random_population(20, 5, 20, 4, 3, len(operators))
+        if fitness_func is None:
+            x, y = training_data()
+            fitness_func = MimicTrainingData(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators, vectorized=True)
+
+        options = {
+            "selection_method": TournamentSelection(0.8, 4),
+            "crossover_method": TwoPointCrossover(0.6, 40),
+            "mutation_method": InstructionMutation(0.1, 4, 3, len(operators)),
+            "minimize": True,
+        }
+        options.update(kwargs)
+        return lgp_class(population=population, fitness_func=fitness_func, **options)
+
+    return make
@@ -0,0 +1,31 @@
+import pytest
+
+from LGP.analysis import balanced_chunks
+
+
+def test_every_item_in_one_chunk():
+    costs = [5, 1, 8, 3, 3, 2, 7]
+    chunks = balanced_chunks(costs, 3)
+
+    assert sorted(i for chunk in chunks for i in chunk) == list(range(len(costs)))
+    assert len(chunks) == 3
+
+
+def test_chunks_are_balanced():
+    costs = [8, 7, 6, 5, 4, 3, 2, 1]
+    chunks = balanced_chunks(costs, 2)
+    totals = [sum(costs[i] for i in chunk) for chunk in chunks]
+
+    assert totals == [18, 18]
+
+
+def test_most_expensive_chunk_first():
+    costs = [10, 1, 1]
+    chunks = balanced_chunks(costs, 2)
+    assert chunks == [[0], [1, 2]]
+
+
+@pytest.mark.parametrize("n_items", (0, 1, 2))
+def test_fewer_items_than_chunks(n_items):
+    chunks = balanced_chunks([1] * n_items, 4)
+    assert len(chunks) == n_items
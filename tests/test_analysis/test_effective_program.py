@@ -0,0 +1,55 @@
+import random
+import pytest
+
+from LGP.analysis import effective_program
+from LGP.evaluation import evaluate, Operators
+from LGP.population import random_individual
+
+
+OPERATORS = [Operators.Add, Operators.Mult, Operators.Sin]
+
+
+@pytest.mark.parametrize(
+        ("chromosome", "effective"),
+        (
+            [   # Nothing to remove
+                ((3, 3, 0, 0),),
+                ((3, 3, 0, 0),),
+            ],
+            [   # Register 1 is never read
+                ((3, 3, 0, 1), (3, 4, 1, 0)),
+                ((3, 4, 1, 0),),
+            ],
+            [   # The first write to register 0 is overwritten
+                ((3, 3, 0, 0), (4, 4, 0, 0)),
+                ((4, 4, 0, 0),),
+            ],
+            [   # Register 1 is read by the output
+                ((3, 3, 0, 1), (1, 4, 1, 0)),
+                ((3, 3, 0, 1), (1, 4, 1, 0)),
+            ],
+            [   # Sin does not read the second operand
+                ((3, 3, 0, 1), (4, 1, 2, 0)),
+                ((4, 1, 2, 0),),
+            ],
+        )
+)
+def test_effective_program(chromosome, effective):
+    assert effective_program(chromosome, [0], OPERATORS) == effective
+
+
+def test_second_operand_is_kept_without_operators():
+    chromosome = ((3, 3, 0, 1), (4, 1, 2, 0))
+    assert effective_program(chromosome, [0]) == chromosome
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_same_output_as_full_program(seed):
+    random.seed(seed)
+    constReg = [1.0, 2.0, 3.0]
+    chromosome = random_individual(100, 3, len(constReg), len(OPERATORS))
+
+    program = effective_program(chromosome, [0, 1], OPERATORS)
+
+    assert len(program) <= len(chromosome)
+    assert evaluate(program, OPERATORS, [0.5, -1.0, 0.0], constReg)[:2] == evaluate(chromosome, OPERATORS, [0.5, -1.0, 0.0], constReg)[:2]
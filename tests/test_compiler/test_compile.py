@@ -0,0 +1,46 @@
+import random
+import pytest
+
+from LGP.compiler import compile, generate_source
+from LGP.evaluation import evaluate, Operators
+from LGP.population import random_individual
+
+
+OPERATORS = [
+    Operators.Add,
+    Operators.Sub,
+    Operators.Mult,
+    Operators.Div,
+    Operators.Sin,
+    Operators.Sqrt,
+]
+
+
+def test_constants_are_inlined():
+    source, namespace = generate_source(((3, 4, 0, 0),), OPERATORS, 3, [1.5, 2])
+    assert "r0 = 1.5 + 2" in source
+    assert namespace == {}
+
+
+def test_non_finite_constants():
+    program = compile(((3, 0, 2, 0),), OPERATORS, 3, [float("inf")])
+    assert program([2.0, 0.0, 0.0]) == [float("inf"), 0.0, 0.0]
+
+
+def test_compiled_chromosome_is_cached():
+    chromosome = ((3, 3, 0, 0), (0, 4, 3, 1))
+    assert compile(chromosome, OPERATORS, 3, [1.0, 0.0]) is compile(chromosome, OPERATORS, 3, [1.0, 0.0])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_same_result_as_evaluate(seed):
+    random.seed(seed)
+    nVar = 4
+    constReg = [1.0, 2.0, 0.0]
+    chromosome = random_individual(100, nVar, len(constReg), len(OPERATORS))
+
+    program = compile(chromosome, OPERATORS, nVar, constReg)
+
+    for _ in range(5):
+        varReg = [random.uniform(-5, 5) for _ in range(nVar)]
+        assert program(list(varReg)) == evaluate(chromosome, OPERATORS, list(varReg), constReg)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from LGP.cse import ExpressionDAG, MimicTrainingDataCSE
+from LGP.fitness import MimicTrainingData
+from LGP.evaluation import Operators, evaluate_vectorized, vectorize_operators
+from LGP.population import random_population
+
+
+OPERATORS = [Operators.Add, Operators.Sub, Operators.Mult, Operators.Div, Operators.Sin]
+CONST_REG = [1.0, 2.0, 3.0]
+
+
+@pytest.fixture
+def make_dag(training_data):
+    def make(max_bytes=2**20):
+        x, _ = training_data(30)
+        varReg = np.zeros((4, x.shape[0]))
+        varReg[0] = x[:, 0]
+        return varReg, ExpressionDAG(vectorize_operators(OPERATORS), varReg, CONST_REG, [0, 1], OPERATORS, max_bytes)
+
+    return make
+
+
+def test_same_output_as_full_evaluation(make_dag):
+    varReg, expressions = make_dag()
+    for individual in random_population(50, 1, 30, 4, 3, len(OPERATORS)):
+        expected = evaluate_vectorized(individual, vectorize_operators(OPERATORS), varReg, CONST_REG)[:2]
+        np.testing.assert_array_equal(expressions.evaluate(individual), expected)
+
+
+def test_shared_subexpressions_are_the_same_node(make_dag):
+    _, expressions = make_dag()
+    # x0 + c0 and c0 + x0 are the same node, as are sin(x0) with different second operands
+    a = ((0, 4, 0, 1), (0, 5, 4, 0))
+    b = ((4, 0, 0, 1), (0, 6, 4, 0))
+    assert expressions.outputs(a) == expressions.outputs(b)
+    assert len(expressions.expressions) == 2
+
+    # Subtraction is not commutative
+    assert expressions.outputs(((0, 4, 1, 1),)) != expressions.outputs(((4, 0, 1, 1),))
+
+
+def test_unique_nodes_are_evaluated_once(make_dag):
+    _, expressions = make_dag()
+    shared = ((0, 4, 2, 1), (1, 1, 0, 1))
+    expressions.evaluate(shared)
+    assert expressions.misses == 2
+
+    expressions.evaluate(shared + ((1, 5, 1, 0),))
+    assert expressions.misses == 3
+    assert expressions.hits == 1
+
+
+def test_cache_is_bounded(make_dag):
+    # Every node value is 30 samples
+    _, expressions = make_dag(max_bytes=3 * 30 * 8)
+    for individual in random_population(20, 5, 10, 4, 3, len(OPERATORS)):
+        expressions.evaluate(individual)
+    assert len(expressions.cache) <= 3
+
+
+@pytest.mark.parametrize("persistent", [True, False])
+def test_fitness_matches_mimic_training_data(persistent, training_data):
+    x, y = training_data(30)
+    population = random_population(30, 1, 30, 4, 3, len(OPERATORS))
+
+    serial = MimicTrainingData(x, y, nVar=4, constReg=CONST_REG, operators=OPERATORS, vectorized=True)
+    cse = MimicTrainingDataCSE(x, y, nVar=4, constReg=CONST_REG, operators=OPERATORS, persistent=persistent)
+    assert cse(population) == pytest.approx(serial(population), nan_ok=True)
+    hits = cse.dag.hits
+
+    # Only a persistent graph remembers the values of the previous generation
+    assert cse(population) == pytest.approx(serial(population), nan_ok=True)
+    assert (cse.dag.hits > hits) == persistent
@@ -0,0 +1,64 @@
+import pickle
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+import pytest
+
+from LGP.data import ArrayDataSource, NpyDataSource, IteratorDataSource, SharedArray, SharedMemoryDataSource
+
+
+X = np.arange(20, dtype=float).reshape((10, 2))
+Y = np.arange(10, dtype=float).reshape((10, 1))
+
+
+def test_array_chunks():
+    source = ArrayDataSource(X, Y, chunk_size=4)
+
+    chunks = list(source.chunks())
+    assert [len(x) for x, _ in chunks] == [4, 4, 2]
+    assert np.array_equal(np.vstack([x for x, _ in chunks]), X)
+    assert np.array_equal(np.vstack([y for _, y in chunks]), Y)
+    assert (source.input_len, source.output_len) == (2, 1)
+
+
+def test_npy_source(tmp_path):
+    np.save(tmp_path / "x.npy", X)
+    np.save(tmp_path / "y.npy", Y)
+
+    source = NpyDataSource(str(tmp_path / "x.npy"), str(tmp_path / "y.npy"), chunk_size=3)
+    assert isinstance(source.x, np.memmap)
+
+    unpickled = pickle.loads(pickle.dumps(source))
+    assert unpickled.x_path == source.x_path
+    assert np.array_equal(np.vstack([x for x, _ in unpickled.chunks()]), X)
+
+
+def test_iterator_source_can_be_read_twice():
+    source = IteratorDataSource(lambda: ((X[i:i + 5], Y[i:i + 5]) for i in range(0, 10, 5)))
+
+    assert (source.input_len, source.output_len) == (2, 1)
+    for _ in range(2):
+        assert np.array_equal(np.vstack([x for x, _ in source.chunks()]), X)
+
+
+def test_shared_array():
+    shared = SharedArray(X)
+    data = pickle.dumps(shared)
+    assert len(data) < X.nbytes
+
+    attached = pickle.loads(data)
+    assert np.array_equal(attached.array, X)
+    assert not attached.array.flags.writeable
+
+    attached.close()
+    shared.close()
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=shared.name)
+
+
+def test_shared_memory_source():
+    source = SharedMemoryDataSource(X, Y, chunk_size=4)
+    unpickled = pickle.loads(pickle.dumps(source))
+
+    assert np.array_equal(np.vstack([x for x, _ in unpickled.chunks()]), X)
+    unpickled.close()
+    source.close()
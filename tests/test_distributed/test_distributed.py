@@ -0,0 +1,105 @@
+import math
+import os
+import signal
+from multiprocessing import Process
+import numpy as np
+import pytest
+
+from LGP.distributed import DistributedFitness, run_worker, pack_batch, unpack_batch
+from LGP.fitness import MimicTrainingData
+from LGP.evaluation import Operators
+from LGP.population import random_population
+
+
+OPERATORS = [Operators.Add, Operators.Sub, Operators.Mult]
+CONST_REG = [1.0, 2.0, 3.0]
+
+
+def Log(x: float, y: float) -> float:
+    return math.log(x)
+
+
+@pytest.fixture
+def data_paths(tmp_path, training_data):
+    x, y = training_data(50)
+    np.save(tmp_path / "x.npy", x)
+    np.save(tmp_path / "y.npy", y)
+    return str(tmp_path / "x.npy"), str(tmp_path / "y.npy")
+
+
+def start_workers(fitness_func, n):
+    host, port = fitness_func.address
+    workers = [Process(target=run_worker, args=(host, port, 0.1), daemon=True) for _ in range(n)]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+def serial_fitness(data_paths, population):
+    x_path, y_path = data_paths
+    return MimicTrainingData(np.load(x_path), np.load(y_path), 4, CONST_REG, OPERATORS)(population)
+
+
+def test_pack_batch():
+    population = random_population(5, 0, 10, 4, 3, len(OPERATORS))
+    assert unpack_batch(*pack_batch(population)) == population
+
+
+def test_same_fitness_as_serial(data_paths):
+    population = random_population(40, 1, 30, 4, 3, len(OPERATORS))
+
+    with DistributedFitness(*data_paths, 4, CONST_REG, OPERATORS, batch_size=7) as fitness_func:
+        workers = start_workers(fitness_func, 3)
+        assert fitness_func(population) == pytest.approx(serial_fitness(data_paths, population))
+        assert fitness_func(population[:3]) == pytest.approx(serial_fitness(data_paths, population[:3]))
+        assert fitness_func([]) == []
+
+    for worker in workers:
+        worker.join(timeout=5)
+        assert not worker.is_alive()
+
+
+def test_lost_worker_tasks_are_retried(data_paths):
+    population = random_population(40, 1, 30, 4, 3, len(OPERATORS))
+
+    with DistributedFitness(*data_paths, 4, CONST_REG, OPERATORS, batch_size=5, heartbeat_timeout=1.0) as fitness_func:
+        workers = start_workers(fitness_func, 2)
+        assert fitness_func(population) == pytest.approx(serial_fitness(data_paths, population))
+
+        # A frozen worker stops sending heartbeats and its batches go to the other worker
+        os.kill(workers[0].pid, signal.SIGSTOP)
+        try:
+            assert fitness_func(population) == pytest.approx(serial_fitness(data_paths, population))
+            assert fitness_func.retries > 0
+        finally:
+            workers[0].kill()
+
+        # Workers can join at any time
+        start_workers(fitness_func, 1)
+        workers[1].kill()
+        workers[1].join()
+        assert fitness_func(population) == pytest.approx(serial_fitness(data_paths, population))
+
+
+def test_worker_with_other_data_is_rejected(data_paths, tmp_path):
+    x_path, y_path = data_paths
+    with DistributedFitness(x_path, y_path, 4, CONST_REG, OPERATORS, worker_timeout=1.0) as fitness_func:
+        np.save(x_path, np.zeros((50, 1)))
+        start_workers(fitness_func, 1)
+        with pytest.raises(RuntimeError, match="No workers"):
+            fitness_func(random_population(5, 1, 10, 4, 3, len(OPERATORS)))
+
+
+def test_call_after_worker_error(data_paths):
+    operators = OPERATORS + [Log]
+    population = random_population(40, 1, 30, 4, 3, len(OPERATORS))
+    failing = [((0, 0, 3, 0),)] + population
+
+    with DistributedFitness(*data_paths, 4, CONST_REG, operators, batch_size=1, vectorized=False) as fitness_func:
+        start_workers(fitness_func, 3)
+        with pytest.raises(RuntimeError, match="math domain error"):
+            fitness_func(failing)
+
+        x_path, y_path = data_paths
+        serial = MimicTrainingData(np.load(x_path), np.load(y_path), 4, CONST_REG, operators, vectorized=False)
+        assert fitness_func(population) == pytest.approx(serial(population))
@@ -0,0 +1,44 @@
+import random
+import numpy as np
+import pytest
+
+from LGP.evaluation import evaluate, evaluate_population, pack_population, vectorize_operators, Operators
+from LGP.population import random_population
+
+
+OPERATORS = [
+    Operators.Add,
+    Operators.Sub,
+    Operators.Mult,
+    Operators.Div,
+]
+
+
+def test_pack_population():
+    population = [((1, 2, 3, 0),), tuple(), ((1, 1, 1, 1), (2, 2, 2, 2))]
+    instructions, lengths = pack_population(population)
+
+    assert instructions.shape == (3, 2, 4)
+    assert list(lengths) == [1, 0, 2]
+    assert instructions[2].tolist() == [[1, 1, 1, 1], [2, 2, 2, 2]]
+
+
+def test_empty_population():
+    result = evaluate_population([], vectorize_operators(OPERATORS), np.zeros((3, 5)), [1.0])
+    assert result.shape == (0, 3, 5)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_same_result_as_evaluate(seed):
+    random.seed(seed)
+    nVar = 4
+    constReg = [1.0, 2.0, 0.0]
+    population = random_population(30, 0, 40, nVar, len(constReg), len(OPERATORS))
+    samples = np.random.default_rng(seed).uniform(-5, 5, size=(nVar, 10))
+
+    result = evaluate_population(population, vectorize_operators(OPERATORS), samples, constReg)
+
+    for i, chromosome in enumerate(population):
+        for j in range(samples.shape[1]):
+            expected = evaluate(chromosome, OPERATORS, [float(v) for v in samples[:, j]], constReg)
+            assert result[i, :, j].tolist() == expected
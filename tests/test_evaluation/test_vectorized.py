@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from LGP.evaluation import evaluate, evaluate_vectorized, vectorize_operators, Operators, VectorizedOperators, ElementwiseOperator
+from LGP.population import random_individual
+
+
+OPERATORS = [
+    Operators.Add,
+    Operators.Sub,
+    Operators.Mult,
+    Operators.Div,
+    Operators.Sin,
+    Operators.Cos,
+    Operators.Sqrt,
+    Operators.Atan2,
+]
+
+
+def test_div_by_zero():
+    result = VectorizedOperators.Div(np.array([1.0, 4.0, -3.0]), np.array([0.0, 2.0, 0.0]))
+    assert list(result) == [10_000_000, 2.0, 10_000_000]
+
+
+def test_sqrt_of_negative():
+    assert list(VectorizedOperators.Sqrt(np.array([-4.0, 9.0]), np.array([0.0, 0.0]))) == [2.0, 3.0]
+
+
+def test_unknown_operator_fallback():
+    max_op = lambda x, y: max(x, y)
+    vectorized = vectorize_operators([Operators.Add, max_op])
+
+    assert vectorized[0] is VectorizedOperators.Add
+    assert isinstance(vectorized[1], ElementwiseOperator)
+    assert list(vectorized[1](np.array([1.0, 5.0]), np.array([3.0, 2.0]))) == [3.0, 5.0]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_same_result_as_scalar_evaluation(seed):
+    rng = np.random.default_rng(seed)
+    nVar = 4
+    constReg = [1.0, 2.0, 0.0]
+    chromosome = random_individual(50, nVar, len(constReg), len(OPERATORS))
+
+    samples = rng.uniform(-5, 5, size=(nVar, 20))
+    result = evaluate_vectorized(chromosome, vectorize_operators(OPERATORS), samples, constReg)
+
+    for i in range(samples.shape[1]):
+        expected = evaluate(chromosome, OPERATORS, [float(v) for v in samples[:, i]], constReg)
+        np.testing.assert_allclose(result[:, i], expected)
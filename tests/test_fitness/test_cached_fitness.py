@@ -0,0 +1,72 @@
+from LGP.cache import CachedFitness
+from LGP.fitness import FitnessBase
+from LGP.evaluation import Operators
+from LGP._typing import Chromosome
+
+
+class CountingFitness(FitnessBase):
+    def __init__(self) -> None:
+        self.evaluated = []
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+    def __call__(self, populaiton: list[Chromosome]) -> list[float]:
+        self.evaluated.extend(populaiton)
+        return [float(sum(sum(instruction) for instruction in individual)) for individual in populaiton]
+
+
+def test_identical_individuals_are_evaluated_once():
+    inner = CountingFitness()
+    fitness_func = CachedFitness(inner, output_registers=[0])
+
+    individual = ((1, 2, 0, 0),)
+    assert fitness_func([individual, individual]) == [3.0, 3.0]
+    assert fitness_func([individual]) == [3.0]
+
+    assert inner.evaluated == [individual]
+    assert fitness_func.hits == 2
+    assert fitness_func.misses == 1
+
+
+def test_introns_share_cache_entry():
+    inner = CountingFitness()
+    fitness_func = CachedFitness(inner, output_registers=[0])
+
+    fitness_func([((1, 2, 0, 0),)])
+    fitness_func([((5, 5, 0, 3), (1, 2, 0, 0))])
+
+    assert len(inner.evaluated) == 1
+    assert fitness_func.hit_rate == 0.5
+
+
+def test_unary_operators_ignore_second_operand():
+    inner = CountingFitness()
+    fitness_func = CachedFitness(inner, output_registers=[0], operators=[Operators.Add, Operators.Sin])
+
+    fitness_func([((1, 2, 1, 0),), ((1, 5, 1, 0),)])
+
+    assert len(inner.evaluated) == 1
+
+
+def test_least_recently_used_is_discarded():
+    inner = CountingFitness()
+    fitness_func = CachedFitness(inner, output_registers=[0], maxsize=2)
+
+    a, b, c = ((1, 1, 0, 0),), ((2, 2, 0, 0),), ((3, 3, 0, 0),)
+    fitness_func([a, b])
+    fitness_func([a])
+    fitness_func([c])
+
+    assert list(fitness_func.cache) == [fitness_func.key(a), fitness_func.key(c)]
+
+    fitness_func([b])
+    assert inner.evaluated == [a, b, c, b]
+
+
+def test_close_closes_wrapped_fitness():
+    inner = CountingFitness()
+    with CachedFitness(inner, output_registers=[0]):
+        pass
+    assert inner.closed
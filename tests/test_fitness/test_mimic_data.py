@@ -1,6 +1,8 @@
+import pytest
 import numpy as np
 
-from LGP.fitness import MimicTrainingData
+from LGP.fitness import MimicTrainingData, MimicTrainingDataBatched
+from LGP.population import random_population
 from LGP.evaluation import Operators
 
 
@@ -15,4 +17,67 @@ def test_fitness_call(mocker):
     fitness = fitness_func([tuple()])
 
     # Assert the average fitness is correct
-    assert fitness == [14 / len(x)]
\ No newline at end of file
+    assert fitness == [14 / len(x)]
+
+
+def test_vectorized_fitness():
+    x = np.linspace(-2, 2, 20).reshape((-1, 1))
+    y = x * x + 1
+    chromosome = ((0, 0, 1, 1), (1, 4, 0, 0))
+
+    scalar = MimicTrainingData(x=x, y=y, nVar=3, operators=[Operators.Add, Operators.Mult], constReg=[0.5, 1.0])
+    vectorized = MimicTrainingData(x=x, y=y, nVar=3, operators=[Operators.Add, Operators.Mult], constReg=[0.5, 1.0], vectorized=True)
+
+    assert vectorized([chromosome, tuple()]) == pytest.approx(scalar([chromosome, tuple()]))
+    assert vectorized([chromosome]) == pytest.approx([0.0])
+
+
+def test_batched_fitness():
+    x = np.linspace(-2, 2, 20).reshape((-1, 1))
+    y = np.hstack((x * x + 1, x))
+    population = random_population(25, 0, 30, 4, 2, 4)
+    operators = [Operators.Add, Operators.Sub, Operators.Mult, Operators.Div]
+
+    serial = MimicTrainingData(x=x, y=y, nVar=4, operators=operators, constReg=[0.5, 1.0])
+    batched = MimicTrainingDataBatched(x=x, y=y, nVar=4, operators=operators, constReg=[0.5, 1.0], batch_size=7)
+
+    assert batched(population) == pytest.approx(serial(population))
+
+
+def test_batched_fitness_memory_bound():
+    x = np.linspace(-2, 2, 1000).reshape((-1, 1))
+    population = random_population(10, 0, 30, 4, 2, 4)
+    operators = [Operators.Add, Operators.Sub, Operators.Mult, Operators.Div]
+
+    # A register of one individual is 6 * 1000 floats
+    serial = MimicTrainingData(x=x, y=x, nVar=4, operators=operators, constReg=[0.5, 1.0])
+    batched = MimicTrainingDataBatched(x=x, y=x, nVar=4, operators=operators, constReg=[0.5, 1.0], max_bytes=3 * 6 * 1000 * 8)
+    assert batched.batch_size == 3
+    assert batched(population) == pytest.approx(serial(population))
+
+    assert MimicTrainingDataBatched(x=x, y=x, nVar=4, operators=operators, constReg=[0.5, 1.0], max_bytes=1).batch_size == 1
+
+
+def test_cost_is_effective_length():
+    x = np.linspace(-1, 1, 5).reshape((-1, 1))
+    fitness_func = MimicTrainingData(x, x, nVar=2, constReg=[1.0], operators=[Operators.Add, Operators.Mult])
+
+    # The second instruction writes to a register that is never read
+    individual = ((0, 2, 0, 0), (0, 2, 1, 1))
+    assert fitness_func.cost(individual) == 2.0
+    assert fitness_func.cost(()) == 1.0
+
+
+def test_cost_tracking():
+    x = np.linspace(-1, 1, 5).reshape((-1, 1))
+    fitness_func = MimicTrainingData(x, x, nVar=2, constReg=[1.0], operators=[Operators.Add, Operators.Mult])
+    population = [((0, 2, 0, 0),), ((0, 2, 0, 0), (0, 0, 1, 0))]
+
+    fitness_func(population)
+    assert fitness_func.actual_cost == []
+    assert fitness_func.seconds_per_cost() is None
+
+    fitness_func.track_cost = True
+    fitness_func(population)
+    assert fitness_func.predicted_cost == [2.0, 3.0]
+    assert len(fitness_func.actual_cost) == 2
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from LGP.fitness import MimicTrainingData, MimicTrainingDataMiniBatch, linear_growth
+from LGP.population import random_population
+
+
+def test_linear_growth():
+    schedule = linear_growth(10, 50, 10, offset=2)
+    assert [schedule(g) for g in range(7)] == [10, 10, 20, 30, 40, 50, 50]
+
+
+@pytest.mark.parametrize("sampling", MimicTrainingDataMiniBatch.SAMPLING)
+def test_samples(sampling, training_data, operators):
+    x, y = training_data(100)
+    fitness_func = MimicTrainingDataMiniBatch(x, y, 4, [1.0], operators, batch_size=30, sampling=sampling)
+
+    samples = fitness_func.samples(0)
+    assert len(samples) == 30
+    assert len(set(samples)) == 30
+    assert all(0 <= s < 100 for s in samples)
+
+
+def test_rotating_samples_cover_data(training_data, operators):
+    x, y = training_data(100)
+    fitness_func = MimicTrainingDataMiniBatch(x, y, 4, [1.0], operators, batch_size=25, sampling="rotating")
+
+    samples = np.concatenate([fitness_func.samples(g) for g in range(4)])
+    assert sorted(samples) == list(range(100))
+
+
+def test_stratified_samples_cover_output_range(training_data, operators):
+    x, y = training_data(100)
+    fitness_func = MimicTrainingDataMiniBatch(x, y, 4, [1.0], operators, batch_size=4, sampling="stratified")
+
+    order = np.argsort(y[:, 0])
+    ranks = sorted(np.flatnonzero(np.isin(order, fitness_func.samples(0))) // 25)
+    assert ranks == [0, 1, 2, 3]
+
+
+def test_full_batch_is_exact(training_data, operators):
+    x, y = training_data(100)
+    population = random_population(10, 1, 20, 4, 3, len(operators))
+
+    full = MimicTrainingData(x, y, 4, [1.0, 2.0, 3.0], operators, vectorized=True)
+    mini_batch = MimicTrainingDataMiniBatch(x, y, 4, [1.0, 2.0, 3.0], operators, batch_size=100)
+
+    assert mini_batch(population) == pytest.approx(full(population))
+    assert mini_batch.exact_fitness(population[0]) == pytest.approx(full.fitness(population[0]))
+
+
+def test_lgp_reports_exact_best(training_data, operators, make_lgp):
+    x, y = training_data(100)
+    full = MimicTrainingData(x, y, 4, [1.0, 2.0, 3.0], operators, vectorized=True)
+    lgp = make_lgp(fitness_func=MimicTrainingDataMiniBatch(x, y, 4, [1.0, 2.0, 3.0], operators, batch_size=5))
+    lgp.run(5, progress=False)
+
+    assert lgp.all_time_best_fitness == pytest.approx(full.fitness(lgp.all_time_best_individual))
+    assert lgp.best_fitness == pytest.approx(full.fitness(lgp.best_individual))
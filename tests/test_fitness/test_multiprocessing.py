@@ -0,0 +1,58 @@
+from multiprocessing.shared_memory import SharedMemory
+import pytest
+
+from LGP.fitness import MimicTrainingData, MimicTrainingDataMultiProcessing, MimicTrainingDataSharedMemory
+from LGP.population import random_population
+
+
+def test_same_fitness_as_serial(training_data, operators):
+    x, y = training_data()
+    population = random_population(20, 1, 30, 4, 3, len(operators))
+
+    serial = MimicTrainingData(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators)
+    with MimicTrainingDataMultiProcessing(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators, workers=2, chunksize=4) as parallel:
+        assert not parallel.balance
+        assert parallel(population) == pytest.approx(serial(population))
+
+
+def test_pool_is_reused_until_closed(training_data, operators):
+    x, y = training_data()
+    population = random_population(4, 1, 10, 4, 3, len(operators))
+
+    fitness_func = MimicTrainingDataMultiProcessing(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators, workers=2)
+    fitness_func(population)
+    pool = fitness_func.pool
+    fitness_func(population)
+    assert fitness_func.pool is pool
+
+    fitness_func.close()
+    assert fitness_func.pool is None
+
+
+def test_shared_memory(training_data, operators):
+    x, y = training_data()
+    population = random_population(20, 1, 30, 4, 3, len(operators))
+
+    serial = MimicTrainingData(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators)
+    with MimicTrainingDataSharedMemory(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators, workers=2) as shared:
+        assert shared(population) == pytest.approx(serial(population))
+        assert shared(population) == pytest.approx(serial(population))
+        name = shared.shared_x.name
+
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+
+
+def test_balanced_chunks_same_fitness_and_cost_diagnostics(training_data, operators):
+    x, y = training_data()
+    population = random_population(20, 1, 30, 4, 3, len(operators))
+
+    serial = MimicTrainingData(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators)
+    with MimicTrainingDataMultiProcessing(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators, workers=2, balance=True) as parallel:
+        parallel.track_cost = True
+        assert parallel(population) == pytest.approx(serial(population))
+
+        assert parallel.predicted_cost == [serial.cost(individual) for individual in population]
+        assert len(parallel.actual_cost) == len(population)
+        assert all(seconds >= 0 for seconds in parallel.actual_cost)
+        assert parallel.seconds_per_cost() > 0
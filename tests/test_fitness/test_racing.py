@@ -0,0 +1,80 @@
+import random
+import pytest
+
+from LGP.cache import CachedFitness
+from LGP.fitness import MimicTrainingData, MimicTrainingDataRacing
+from LGP.population import random_population
+
+
+def test_first_generation_is_exact(training_data, operators):
+    x, y = training_data(100)
+    population = random_population(20, 1, 20, 4, 3, len(operators))
+
+    full = MimicTrainingData(x, y, 4, [1.0, 2.0, 3.0], operators, vectorized=True)
+    racing = MimicTrainingDataRacing(x, y, 4, [1.0, 2.0, 3.0], operators, k=5, chunk_size=10)
+
+    assert racing(population) == pytest.approx(full(population))
+    assert racing.aborted == 0
+    assert racing.evaluated_samples == 20 * 100
+
+
+def test_k_best_are_exact(training_data, operators):
+    # An unlucky population where more than k individuals tie at the threshold never aborts
+    random.seed(0)
+    x, y = training_data(100)
+    population = random_population(50, 1, 20, 4, 3, len(operators))
+    k = 10
+
+    full = MimicTrainingData(x, y, 4, [1.0, 2.0, 3.0], operators, vectorized=True)(population)
+    racing = MimicTrainingDataRacing(x, y, 4, [1.0, 2.0, 3.0], operators, k=k, chunk_size=10)
+    racing(population)
+    threshold = racing.threshold
+    fitness = racing(population)
+
+    assert threshold == pytest.approx(sorted(full)[k - 1])
+    assert racing.aborted > 0
+    assert racing.evaluated_samples < 50 * 100
+
+    for exact, raced in zip(full, fitness):
+        if exact <= threshold + 1e-9:
+            assert raced == pytest.approx(exact)
+        else:
+            # Aborted individuals get a lower bound above the threshold
+            assert threshold < raced <= exact + 1e-9
+
+    # The k best individuals have the same fitness
+    assert sorted(fitness)[:k] == pytest.approx(sorted(full)[:k])
+
+
+def test_exact_fitness_is_not_raced(training_data, operators):
+    random.seed(1)
+    x, y = training_data(100)
+    population = random_population(20, 1, 20, 4, 3, len(operators))
+
+    full = MimicTrainingData(x, y, 4, [1.0, 2.0, 3.0], operators, vectorized=True)
+    racing = MimicTrainingDataRacing(x, y, 4, [1.0, 2.0, 3.0], operators, k=1, chunk_size=10)
+    racing(population)
+    threshold = racing.threshold
+
+    worst = max(population, key=full.fitness)
+    assert racing.exact_fitness(worst) == pytest.approx(full.fitness(worst))
+    assert racing.threshold == threshold
+
+
+def test_lower_bounds_are_not_cached(training_data, operators):
+    random.seed(0)
+    x, y = training_data(100)
+    population = random_population(50, 1, 20, 4, 3, len(operators))
+
+    full = MimicTrainingData(x, y, 4, [1.0, 2.0, 3.0], operators, vectorized=True)
+    racing = MimicTrainingDataRacing(x, y, 4, [1.0, 2.0, 3.0], operators, k=10, chunk_size=10)
+    racing(population)
+    cached = CachedFitness(racing, output_registers=[0], operators=operators)
+    cached(population)
+
+    assert sum(racing.lower_bound) == racing.aborted > 0
+    assert len(cached.cache) == cached.misses - racing.aborted
+    for individual in population:
+        key = cached.key(individual)
+        if key in cached.cache:
+            assert cached.cache[key] == pytest.approx(full.fitness(individual))
@@ -0,0 +1,47 @@
+import pytest
+
+from LGP.fitness import MimicTrainingData, MimicTrainingDataSharded
+from LGP.population import random_population
+
+
+@pytest.mark.parametrize("replicas", [1, 2])
+def test_same_fitness_as_serial(replicas, training_data, operators):
+    x, y = training_data(101)
+    population = random_population(15, 1, 30, 4, 3, len(operators))
+
+    serial = MimicTrainingData(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators)
+    with MimicTrainingDataSharded(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators, shards=3, replicas=replicas) as sharded:
+        assert sharded(population) == pytest.approx(serial(population))
+        assert len(sharded.processes) == 3 * replicas
+
+        # A single individual is evaluated on all shards
+        assert sharded.exact_fitness(population[0]) == pytest.approx(serial.fitness(population[0]))
+        assert sharded([]) == []
+
+
+def test_workers_are_reused_until_closed(training_data, operators):
+    x, y = training_data(101)
+    population = random_population(4, 1, 10, 4, 3, len(operators))
+
+    fitness_func = MimicTrainingDataSharded(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators, shards=2)
+    fitness_func(population)
+    processes = list(fitness_func.processes)
+    fitness_func(population)
+    assert fitness_func.processes == processes
+
+    fitness_func.close()
+    assert fitness_func.processes == []
+    assert not any(process.is_alive() for process in processes)
+
+
+def test_worker_error_is_raised_and_workers_restart(training_data, operators):
+    x, y = training_data(101)
+    with MimicTrainingDataSharded(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators, shards=2) as sharded:
+        with pytest.raises(RuntimeError, match="Shard worker failed"):
+            # The register index is out of range
+            sharded([((99, 1, 0, 0),)])
+
+        # The workers are started again and every reply of the failed call was read
+        population = random_population(6, 1, 10, 4, 3, len(operators))
+        serial = MimicTrainingData(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators)
+        assert sharded(population) == pytest.approx(serial(population))
@@ -0,0 +1,28 @@
+import pytest
+
+from LGP.data import ArrayDataSource, IteratorDataSource
+from LGP.fitness import MimicTrainingData, MimicTrainingDataStream
+from LGP.population import random_population
+
+
+@pytest.mark.parametrize("vectorized", (True, False))
+def test_same_fitness_as_in_memory(vectorized, training_data, operators):
+    x, y = training_data(95)
+    population = random_population(10, 1, 20, 4, 3, len(operators))
+
+    full = MimicTrainingData(x, y, 4, [1.0, 2.0, 3.0], operators)
+    stream = MimicTrainingDataStream(ArrayDataSource(x, y, chunk_size=10), 4, [1.0, 2.0, 3.0], operators, vectorized=vectorized)
+
+    assert stream(population) == pytest.approx(full(population))
+    assert stream.fitness(population[0]) == pytest.approx(full.fitness(population[0]))
+
+
+def test_iterator_source(training_data, operators):
+    x, y = training_data(95)
+    population = random_population(10, 1, 20, 4, 3, len(operators))
+
+    full = MimicTrainingData(x, y, 4, [1.0, 2.0, 3.0], operators, vectorized=True)
+    source = IteratorDataSource(lambda: ((x[i:i + 7], y[i:i + 7]) for i in range(0, len(x), 7)))
+    stream = MimicTrainingDataStream(source, 4, [1.0, 2.0, 3.0], operators)
+
+    assert stream(population) == pytest.approx(full(population))
@@ -0,0 +1,49 @@
+import pytest
+
+from LGP.fitness import MimicTrainingData, MimicTrainingDataThreaded
+from LGP.population import random_population
+
+
+@pytest.mark.parametrize("balance", [True, False])
+def test_same_fitness_as_serial(balance, training_data, operators):
+    x, y = training_data(200)
+    population = random_population(30, 1, 30, 4, 3, len(operators))
+
+    serial = MimicTrainingData(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators)
+    with MimicTrainingDataThreaded(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators, workers=3, balance=balance, chunksize=7) as threaded:
+        assert threaded(population) == pytest.approx(serial(population))
+        assert threaded([]) == []
+
+
+def test_lambda_operators(training_data):
+    x, y = training_data(200)
+    operators = [lambda a, b: a + b, lambda a, b: a * b]
+    population = random_population(10, 1, 10, 4, 3, len(operators))
+
+    serial = MimicTrainingData(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators)
+    with pytest.warns(RuntimeWarning, match="GIL"):
+        threaded = MimicTrainingDataThreaded(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators, workers=2)
+    with threaded:
+        assert threaded(population) == pytest.approx(serial(population))
+
+
+def test_chunksize_disables_balance(training_data, operators):
+    x, y = training_data(200)
+    assert MimicTrainingDataThreaded(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators).balance
+    assert not MimicTrainingDataThreaded(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators, chunksize=5).balance
+
+
+def test_executor_is_reused_until_closed(training_data, operators):
+    x, y = training_data(200)
+    population = random_population(4, 1, 10, 4, 3, len(operators))
+
+    fitness_func = MimicTrainingDataThreaded(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators, workers=2)
+    fitness_func.track_cost = True
+    fitness_func(population)
+    executor = fitness_func.executor
+    fitness_func(population)
+    assert fitness_func.executor is executor
+    assert len(fitness_func.actual_cost) == len(population)
+
+    fitness_func.close()
+    assert fitness_func.executor is None
@@ -0,0 +1,70 @@
+import json
+import pickle
+import random
+import numpy as np
+
+from LGP.genome import CompactChromosome
+from LGP.crossover import TwoPointCrossover
+from LGP.mutation import InstructionMutation, InsertMutation, DeleteMutation
+from LGP.evaluation import evaluate, Operators
+from LGP.population import random_individual
+
+
+INSTRUCTIONS = ((0, 1, 2, 3), (4, 5, 0, 1), (2, 2, 1, 0))
+
+
+def test_behaves_like_tuple():
+    chromosome = CompactChromosome(INSTRUCTIONS)
+
+    assert len(chromosome) == 3
+    assert chromosome[1] == (4, 5, 0, 1)
+    assert list(chromosome) == list(INSTRUCTIONS)
+    assert chromosome == INSTRUCTIONS
+    assert hash(chromosome) == hash(INSTRUCTIONS)
+    assert {INSTRUCTIONS: 1}[chromosome] == 1
+
+
+def test_slicing_and_concatenation():
+    chromosome = CompactChromosome(INSTRUCTIONS)
+
+    assert isinstance(chromosome[1:], CompactChromosome)
+    assert np.shares_memory(chromosome[1:].data, chromosome.data)
+    assert chromosome[:1] + chromosome[2:] == (INSTRUCTIONS[0], INSTRUCTIONS[2])
+    assert chromosome[:0] + INSTRUCTIONS == INSTRUCTIONS
+    assert INSTRUCTIONS[:1] + chromosome[1:] == INSTRUCTIONS
+    assert isinstance(INSTRUCTIONS[:1] + chromosome[1:], CompactChromosome)
+
+
+def test_empty_chromosome():
+    chromosome = CompactChromosome()
+    assert len(chromosome) == 0
+    assert chromosome == tuple()
+
+
+def test_pickle():
+    chromosome = CompactChromosome(INSTRUCTIONS, dtype=np.uint8)
+    unpickled = pickle.loads(pickle.dumps(chromosome))
+
+    assert unpickled == chromosome
+    assert unpickled.dtype == np.uint8
+
+
+def test_operators_keep_representation():
+    random.seed(0)
+    chromosome = CompactChromosome(random_individual(50, 4, 3, 3))
+
+    offspring1, offspring2 = TwoPointCrossover(1.0, 200).crossover(chromosome, chromosome[10:])
+    assert isinstance(offspring1, CompactChromosome)
+    assert isinstance(offspring2, CompactChromosome)
+
+    for mutation in (InstructionMutation(0.5, 4, 3, 3), InsertMutation(0.5, 4, 3, 3), DeleteMutation(0.5, 4, 3, 3)):
+        assert isinstance(mutation.mutate(chromosome), CompactChromosome)
+
+
+def test_evaluation():
+    random.seed(1)
+    individual = random_individual(50, 4, 3, 3)
+    operators = [Operators.Add, Operators.Sub, Operators.Mult]
+
+    assert evaluate(CompactChromosome(individual), operators, [1.0, 0.0, 0.0, 0.0], [1.0, 2.0, 3.0]) == evaluate(individual, operators, [1.0, 0.0, 0.0, 0.0], [1.0, 2.0, 3.0])
+    assert json.loads(json.dumps([list(instruction) for instruction in CompactChromosome(individual)])) == [list(instruction) for instruction in individual]
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from LGP.incremental import IncrementalEvaluator, MimicTrainingDataIncremental
+from LGP.fitness import MimicTrainingData
+from LGP.evaluation import Operators, evaluate_vectorized, vectorize_operators
+from LGP.crossover import TwoPointCrossover
+from LGP.mutation import InstructionMutation
+from LGP.population import random_population
+
+
+OPERATORS = [Operators.Add, Operators.Sub, Operators.Mult, Operators.Div, Operators.Sin]
+CONST_REG = [1.0, 2.0, 3.0]
+
+
+@pytest.fixture
+def make_evaluator(training_data):
+    def make(interval=3, max_bytes=2**20, output_registers=None):
+        x, _ = training_data(30)
+        varReg = np.zeros((4, x.shape[0]))
+        varReg[0] = x[:, 0]
+        return varReg, IncrementalEvaluator(vectorize_operators(OPERATORS), varReg, CONST_REG, interval, max_bytes, output_registers, OPERATORS)
+
+    return make
+
+
+def test_same_registers_as_full_evaluation(make_evaluator):
+    varReg, incremental = make_evaluator()
+    population = random_population(30, 1, 20, 4, 3, len(OPERATORS))
+
+    for individual in population + population:
+        expected = evaluate_vectorized(individual, vectorize_operators(OPERATORS), varReg, CONST_REG)
+        np.testing.assert_array_equal(incremental.evaluate(individual), expected)
+
+
+def test_offspring_resume_from_parent(make_evaluator):
+    varReg, incremental = make_evaluator(interval=2)
+    parent = ((0, 4, 0, 1), (1, 5, 2, 2), (2, 0, 1, 3), (3, 1, 0, 1), (1, 1, 2, 0), (0, 6, 3, 0))
+    incremental.evaluate(parent)
+    assert incremental.misses == 1
+
+    # A point mutation of the fifth instruction can resume after the fourth
+    child = parent[:4] + ((1, 0, 2, 0),) + parent[5:]
+    expected = evaluate_vectorized(child, vectorize_operators(OPERATORS), varReg, CONST_REG)
+    np.testing.assert_array_equal(incremental.evaluate(child), expected)
+    assert incremental.hits == 1
+    assert incremental.skipped == 4
+
+
+def test_tail_introns_are_skipped(make_evaluator):
+    _, incremental = make_evaluator(interval=4, output_registers=[0])
+    incremental.evaluate(((0, 4, 0, 0), (0, 4, 2, 1), (1, 1, 2, 2)))
+    assert incremental.executed == 1
+
+
+def test_snapshots_are_bounded(make_evaluator):
+    # Every snapshot is 4 registers of 30 samples
+    _, incremental = make_evaluator(interval=1, max_bytes=5 * 4 * 30 * 8)
+    assert incremental.maxsize == 5
+    for individual in random_population(10, 5, 10, 4, 3, len(OPERATORS)):
+        incremental.evaluate(individual)
+    assert len(incremental.snapshots) == 5
+
+    incremental.clear()
+    assert len(incremental.snapshots) == 0
+    assert incremental.hit_rate == 0.0
+
+
+def test_fitness_matches_mimic_training_data(training_data):
+    x, y = training_data(30)
+    population = random_population(20, 5, 30, 4, 3, len(OPERATORS))
+
+    serial = MimicTrainingData(x, y, nVar=4, constReg=CONST_REG, operators=OPERATORS, vectorized=True)
+    incremental = MimicTrainingDataIncremental(x, y, nVar=4, constReg=CONST_REG, operators=OPERATORS, interval=2)
+    assert incremental(population) == pytest.approx(serial(population), nan_ok=True)
+
+    crossover = TwoPointCrossover(1.0, 60)
+    mutation = InstructionMutation(0.05, 4, 3, len(OPERATORS))
+    offspring = []
+    for parent1, parent2 in zip(population[::2], population[1::2]):
+        offspring.extend(mutation.mutate(child) for child in crossover.crossover(parent1, parent2))
+
+    assert incremental(offspring) == pytest.approx(serial(offspring), nan_ok=True)
+    assert incremental.evaluator.skipped > 0
+
+
+def test_snapshot_keys_are_one_interval_long(make_evaluator):
+    _, incremental = make_evaluator(interval=2)
+    chromosome = ((0, 4, 0, 1), (1, 5, 2, 2), (2, 0, 1, 3), (3, 1, 0, 1), (1, 1, 2, 0))
+    incremental.evaluate(chromosome)
+
+    assert [len(instructions) for _, instructions in incremental.snapshots] == [2, 2]
+    (first_parent, _), (second_parent, _) = incremental.snapshots
+    assert first_parent == 0
+    assert second_parent == incremental.snapshots[(0, chromosome[:2])][0]
@@ -0,0 +1,116 @@
+import os
+import threading
+from multiprocessing import Pipe
+import numpy as np
+import pytest
+
+from LGP.LGP import LGP
+from LGP.island import IslandLGP, ring_topology, random_topology, _island_worker
+from LGP.fitness import FitnessBase, MimicTrainingData, MimicTrainingDataMultiProcessing
+from LGP.selection import TournamentSelection
+from LGP.crossover import TwoPointCrossover
+from LGP.mutation import InstructionMutation
+from LGP.evaluation import Operators
+from LGP.population import random_population
+
+
+OPERATORS = [Operators.Add, Operators.Sub, Operators.Mult]
+
+
+def poly_lgp(index: int) -> LGP:
+    x = np.linspace(-5, 5, 20).reshape((-1, 1))
+    y = np.polyval([1, 4, -10, -7], x)
+    return LGP(
+        population=random_population(20, 5, 20, 4, 3, len(OPERATORS)),
+        selection_method=TournamentSelection(0.8, 4),
+        crossover_method=TwoPointCrossover(0.6, 40),
+        mutation_method=InstructionMutation(0.1, 4, 3, len(OPERATORS)),
+        fitness_func=MimicTrainingData(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=OPERATORS, vectorized=True),
+        minimize=True,
+    )
+
+
+def pool_lgp(index: int) -> LGP:
+    lgp = poly_lgp(index)
+    fitness_func = lgp.fitness_func
+    lgp.fitness_func = MimicTrainingDataMultiProcessing(fitness_func.x, fitness_func.y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=OPERATORS, workers=1)
+    return lgp
+
+
+def failing_lgp(index: int) -> LGP:
+    raise ValueError("Bad island")
+
+
+def dying_lgp(index: int) -> LGP:
+    # The island exits without reporting anything
+    os._exit(1)
+
+
+def test_ring_topology():
+    assert ring_topology(4) == [1, 2, 3, 0]
+
+
+@pytest.mark.parametrize("n_islands", (1, 2, 5))
+def test_random_topology(n_islands):
+    destinations = random_topology(n_islands)
+    assert len(destinations) == n_islands
+    assert all(0 <= d < n_islands for d in destinations)
+    if n_islands > 1:
+        assert all(d != i for i, d in enumerate(destinations))
+
+
+def test_island_run():
+    islands = IslandLGP(poly_lgp, n_islands=3, migration_interval=2, n_migrants=2, seed=1)
+    best = islands.run(5)
+
+    assert islands.minimize
+    assert islands.all_time_best_individual == best
+    assert islands.all_time_best_fitness == min(islands.island_best_fitness)
+    assert [len(log) for log in islands.best_fitness_logs] == [5, 5, 5]
+
+
+def test_island_error():
+    islands = IslandLGP(failing_lgp, n_islands=2)
+    with pytest.raises(RuntimeError, match="Bad island"):
+        islands.run(2)
+
+
+def test_island_dies_silently():
+    islands = IslandLGP(dying_lgp, n_islands=2)
+    with pytest.raises(RuntimeError, match=r"Island \d stopped unexpectedly"):
+        islands.run(2)
+
+
+def test_island_with_worker_pool():
+    islands = IslandLGP(pool_lgp, n_islands=2, migration_interval=1, seed=1)
+    islands.run(2)
+    assert [len(log) for log in islands.best_fitness_logs] == [2, 2]
+
+
+def test_island_worker_evaluates_once_per_generation():
+    lgp = poly_lgp(0)
+    calls = []
+
+    class CountingFitness(FitnessBase):
+        def __init__(self, fitness_func):
+            self.fitness_func = fitness_func
+
+        def __call__(self, population):
+            calls.append(len(population))
+            return self.fitness_func(population)
+
+    lgp.fitness_func = CountingFitness(lgp.fitness_func)
+
+    parent_connection, child_connection = Pipe()
+    worker = threading.Thread(target=_island_worker, args=(0, lambda index: lgp, 1, child_connection))
+    worker.start()
+    parent_connection.send(("evolve", [], 3, 2))
+    status, migrants, *_ = parent_connection.recv()
+    parent_connection.send(("stop",))
+    parent_connection.recv()
+    worker.join()
+
+    # The migrants are taken from the last generation of the run
+    assert status == "ok"
+    assert len(calls) == 3
+    assert [f for _, f in migrants] == sorted(lgp.last_fitness)[:2]
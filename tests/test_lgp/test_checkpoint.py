@@ -0,0 +1,114 @@
+import os
+import random
+import numpy as np
+import pytest
+
+from LGP.LGP import LGP
+from LGP.steady_state import SteadyStateLGP
+from LGP.crossover import TwoPointCrossover
+from LGP.mutation import InstructionMutation, InsertMutation, DeleteMutation
+from LGP.genome import CompactChromosome
+from LGP.population import random_population
+
+
+@pytest.fixture
+def make_checkpoint_lgp(make_lgp, operators):
+    def make(population, lgp_class=LGP):
+        return make_lgp(
+            population,
+            lgp_class=lgp_class,
+            crossover_method=TwoPointCrossover(0.6, 60),
+            mutation_method=[
+                InstructionMutation(0.3, 4, 3, len(operators)),
+                InsertMutation(0.05, 4, 3, len(operators)),
+                DeleteMutation(0.05, 4, 3, len(operators)),
+            ],
+            elitism=True,
+            len_punishment=0.01,
+        )
+
+    return make
+
+
+def seeded_population(operators, compact=False):
+    random.seed(42)
+    np.random.seed(42)
+    return random_population(30, 5, 30, 4, 3, len(operators), compact=compact)
+
+
+def test_resume_is_bit_exact(tmp_path, make_checkpoint_lgp, operators):
+    filename = str(tmp_path / "run.npz")
+
+    uninterrupted = make_checkpoint_lgp(seeded_population(operators))
+    uninterrupted.run(6, progress=False)
+
+    interrupted = make_checkpoint_lgp(seeded_population(operators))
+    interrupted.enable_checkpoints(filename, generations=3)
+    interrupted.run(3, progress=False)
+    assert os.listdir(tmp_path) == ["run.npz"]
+
+    # Mess up the random state before resuming
+    random.seed(0)
+    np.random.seed(0)
+
+    resumed = make_checkpoint_lgp([])
+    resumed.mutation_method[0].pMutate = 1.0
+    resumed.resume(filename)
+    assert resumed.generation == 3
+    assert resumed.mutation_method[0].pMutate == 0.3
+    resumed.run(3, progress=False)
+
+    assert resumed.population == uninterrupted.population
+    assert resumed.best_fitness_log == uninterrupted.best_fitness_log
+    assert resumed.avg_fitness_log == uninterrupted.avg_fitness_log
+    assert resumed.all_time_best_individual == uninterrupted.all_time_best_individual
+    assert resumed.all_time_best_fitness == uninterrupted.all_time_best_fitness
+
+
+def test_compact_population(tmp_path, make_checkpoint_lgp, operators):
+    filename = str(tmp_path / "run.npz")
+
+    lgp = make_checkpoint_lgp(seeded_population(operators, compact=True))
+    lgp.run(1, progress=False)
+    lgp.save_checkpoint(filename)
+
+    resumed = make_checkpoint_lgp([])
+    resumed.resume(filename)
+    assert resumed.population == lgp.population
+    assert all(isinstance(chromosome, CompactChromosome) for chromosome in resumed.population)
+
+
+def test_compact_dtype_is_restored(tmp_path, make_checkpoint_lgp, operators):
+    filename = str(tmp_path / "run.npz")
+
+    population = [CompactChromosome(chromosome, dtype=np.uint8) for chromosome in seeded_population(operators)]
+    lgp = make_checkpoint_lgp(population)
+    lgp.run(1, progress=False)
+    lgp.save_checkpoint(filename)
+
+    resumed = make_checkpoint_lgp([])
+    resumed.resume(filename)
+    assert resumed.population == lgp.population
+    assert [chromosome.dtype for chromosome in resumed.population] == [chromosome.dtype for chromosome in lgp.population]
+    assert resumed.population[0].dtype == np.uint8
+
+
+def test_steady_state(tmp_path, make_checkpoint_lgp, operators):
+    filename = str(tmp_path / "run.npz")
+
+    lgp = make_checkpoint_lgp(seeded_population(operators), SteadyStateLGP)
+    lgp.run(5, progress=False)
+    lgp.save_checkpoint(filename)
+
+    fitness = list(lgp.fitness)
+    evaluations = lgp.evaluations
+    lgp.run(5, progress=False)
+
+    resumed = make_checkpoint_lgp([], SteadyStateLGP)
+    resumed.resume(filename)
+    assert resumed.fitness == fitness
+    assert resumed.evaluations == evaluations
+
+    resumed.run(5, progress=False)
+    assert resumed.population == lgp.population
+    assert resumed.fitness == lgp.fitness
@@ -0,0 +1,68 @@
+from LGP.steady_state import SteadyStateLGP
+from LGP.selection import TournamentSelection
+from LGP.crossover import TwoPointCrossover
+from LGP.mutation import InsertMutation
+
+from .test_lgp import NoMutation, NoCrossover, LenFitness, MaxSelection
+
+
+class CountingLenFitness(LenFitness):
+    def __init__(self) -> None:
+        self.evaluated = 0
+
+    def __call__(self, populaiton):
+        self.evaluated += len(populaiton)
+        return super().__call__(populaiton)
+
+
+def test_only_offspring_are_evaluated():
+    fitness_func = CountingLenFitness()
+    lgp = SteadyStateLGP(
+        population=[((0, 0, 0, 0),) * i for i in range(10)],
+        selection_method=TournamentSelection(0.8, 2),
+        crossover_method=TwoPointCrossover(0.5, 20),
+        mutation_method=InsertMutation(0.1, 3, 3, 3),
+        fitness_func=fitness_func,
+        offspring_per_step=3,
+    )
+
+    lgp.run(5, progress=False)
+    assert fitness_func.evaluated == 10 + 5 * 3
+    assert lgp.evaluations == fitness_func.evaluated
+    assert len(lgp.population) == 10
+    assert len(lgp.best_fitness_log) == 6
+    assert lgp.fitness == [len(individual) for individual in lgp.population]
+
+
+def test_best_takes_over():
+    lgp = SteadyStateLGP(
+        population=[((0, 0, 0, 0),) * i for i in range(10)],
+        selection_method=MaxSelection(),
+        crossover_method=NoCrossover(),
+        mutation_method=NoMutation(),
+        fitness_func=LenFitness(),
+        elitism=True,
+        offspring_per_step=2,
+        replacement_size=10,
+    )
+
+    lgp.run(50, progress=False)
+    assert lgp.best_fitness == 9
+    assert lgp.population == [((0, 0, 0, 0),) * 9 for _ in range(10)]
+
+
+def test_minimize_replaces_worst():
+    lgp = SteadyStateLGP(
+        population=[((0, 0, 0, 0),) * i for i in range(10)],
+        selection_method=MaxSelection(),
+        crossover_method=NoCrossover(),
+        mutation_method=NoMutation(),
+        fitness_func=LenFitness(),
+        minimize=True,
+        offspring_per_step=2,
+        replacement_size=10,
+    )
+
+    lgp.run(50, progress=False)
+    assert lgp.all_time_best_fitness == 0
+    assert lgp.population == [tuple() for _ in range(10)]
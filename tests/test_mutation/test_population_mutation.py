@@ -0,0 +1,53 @@
+import numpy as np
+
+from LGP.mutation import InstructionMutation, InsertMutation, DeleteMutation
+from LGP.genome import CompactChromosome
+
+
+POPULATION = [tuple((-1, -1, -1, -1) for _ in range(n)) for n in (0, 5, 100, 1000)]
+
+
+def test_no_mutation_keeps_chromosomes():
+    for mutation in (InstructionMutation(0.0, 5, 5, 5), InsertMutation(0.0, 5, 5, 5), DeleteMutation(0.0, 5, 5, 5)):
+        new_population = mutation.mutate_population(POPULATION)
+        assert all(new is old for new, old in zip(new_population, POPULATION))
+
+
+def test_instruction_mutation_variation():
+    new_population = InstructionMutation(1.0, 5, 5, 5).mutate_population(POPULATION)
+
+    assert [len(chromosome) for chromosome in new_population] == [len(chromosome) for chromosome in POPULATION]
+
+    instructions = np.array([instruction for chromosome in new_population for instruction in chromosome])
+    # Exactly one field is changed in every instruction
+    assert np.all(np.sum(instructions != -1, axis=1) == 1)
+
+    assert set(instructions[:, 0]) - {-1} == set(range(10))
+    assert set(instructions[:, 1]) - {-1} == set(range(10))
+    assert set(instructions[:, 2]) - {-1} == set(range(5))
+    assert set(instructions[:, 3]) - {-1} == set(range(5))
+
+
+def test_insert_mutation():
+    new_population = InsertMutation(1.0, 5, 5, 5).mutate_population(POPULATION)
+
+    for new, old in zip(new_population, POPULATION):
+        assert len(new) == 2 * len(old) + 1
+        assert new[1::2] == old
+        assert all(instruction[3] < 5 for instruction in new[::2])
+
+
+def test_insert_mutation_max_len():
+    new_population = InsertMutation(1.0, 5, 5, 5, max_len=50).mutate_population(POPULATION)
+    assert [len(chromosome) for chromosome in new_population] == [1, 11, 100, 1000]
+
+
+def test_delete_mutation():
+    new_population = DeleteMutation(1.0, 5, 5, 5, min_len=10).mutate_population(POPULATION)
+    assert [len(chromosome) for chromosome in new_population] == [0, 5, 0, 0]
+
+
+def test_compact_chromosomes():
+    population = [CompactChromosome(((1, 1, 1, 1),) * 10), CompactChromosome(((2, 2, 2, 2),) * 20)]
+    for mutation in (InstructionMutation(0.5, 5, 5, 5), InsertMutation(0.5, 5, 5, 5), DeleteMutation(0.5, 5, 5, 5)):
+        assert all(isinstance(chromosome, CompactChromosome) for chromosome in mutation.mutate_population(population))
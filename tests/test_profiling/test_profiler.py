@@ -0,0 +1,54 @@
+from LGP.steady_state import SteadyStateLGP
+from LGP.cache import CachedFitness
+from LGP.fitness import MimicTrainingData
+from LGP.profiling import NullProfiler, Profiler
+
+
+PHASES = ("fitness", "log", "selection", "crossover", "mutation", "callbacks")
+
+
+def test_disabled_by_default(make_lgp):
+    lgp = make_lgp()
+    assert isinstance(lgp.profiler, NullProfiler)
+    assert not isinstance(lgp.profiler, Profiler)
+
+
+def test_generation_records(make_lgp):
+    lgp = make_lgp()
+    records = []
+    profiler = lgp.enable_profiling(callback=records.append)
+    lgp.run(3, progress=False)
+
+    assert profiler.records == records
+    assert [record["generation"] for record in records] == [0, 1, 2]
+    for record in records:
+        for phase in PHASES:
+            assert record[f"{phase}_wall"] >= 0
+            assert record[f"{phase}_cpu"] >= 0
+        assert record["wall"] >= record["fitness_wall"]
+        assert record["evaluations"] == 20
+        assert record["avg_effective_length"] <= record["avg_length"]
+        assert record["instructions_per_second"] is not None
+        assert record["cache_hit_rate"] is None
+
+
+def test_cache_hit_rate(make_lgp, training_data, operators):
+    x, y = training_data()
+    fitness_func = MimicTrainingData(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators, vectorized=True)
+    lgp = make_lgp(fitness_func=CachedFitness(fitness_func, output_registers=[0], operators=operators))
+    profiler = lgp.enable_profiling()
+    lgp.run(3, progress=False)
+
+    assert all(0 <= record["cache_hit_rate"] <= 1 for record in profiler.records)
+    # The wrapped fitness function is used for the effective length
+    assert profiler.records[0]["avg_effective_length"] is not None
+
+
+def test_steady_state(make_lgp):
+    lgp = make_lgp(lgp_class=SteadyStateLGP)
+    profiler = lgp.enable_profiling()
+    lgp.run(4, progress=False)
+
+    assert len(profiler.records) == 4
+    assert all(record["evaluations"] == 2 for record in profiler.records)
+    assert all("replacement_wall" in record for record in profiler.records)
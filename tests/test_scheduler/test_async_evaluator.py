@@ -0,0 +1,53 @@
+import pytest
+
+from LGP.scheduler import AsyncEvaluator
+from LGP.steady_state import SteadyStateLGP
+from LGP.fitness import MimicTrainingData
+from LGP.population import random_population
+
+
+@pytest.fixture
+def make_fitness(training_data, operators):
+    def make():
+        x, y = training_data()
+        return MimicTrainingData(x, y, nVar=4, constReg=[1.0, 2.0, 3.0], operators=operators, vectorized=True)
+
+    return make
+
+
+def test_same_fitness_as_serial(make_fitness, operators):
+    population = random_population(30, 0, 40, 4, 3, len(operators))
+    serial = make_fitness()
+
+    with AsyncEvaluator(make_fitness(), workers=2, chunks_per_worker=3) as evaluator:
+        assert evaluator(population) == pytest.approx(serial(population))
+        assert len(evaluator.submit(population)) == 6
+        assert sorted(index for index, _ in evaluator.as_completed(population)) == list(range(30))
+
+
+def test_cost_is_effective_length(make_fitness):
+    evaluator = AsyncEvaluator(make_fitness())
+    assert evaluator.cost(((4, 4, 0, 1), (4, 4, 0, 0))) == 2
+
+
+def test_close_closes_wrapped_fitness(training_data, operators):
+    closed = []
+
+    class ClosingFitness(MimicTrainingData):
+        def close(self) -> None:
+            closed.append(True)
+
+    x, y = training_data()
+    with AsyncEvaluator(ClosingFitness(x, y, 4, [1.0], operators), workers=1):
+        pass
+    assert closed == [True]
+
+
+def test_steady_state_run_async(make_fitness, make_lgp):
+    lgp = make_lgp(lgp_class=SteadyStateLGP, offspring_per_step=3)
+
+    with AsyncEvaluator(make_fitness(), workers=2) as evaluator:
+        lgp.run_async(25, evaluator, progress=False)
+
+    assert lgp.evaluations == 20 + 25
+    assert lgp.fitness == pytest.approx(make_fitness()(lgp.population))
@@ -1,4 +1,6 @@
 import pytest
+import random
+import numpy as np
 from LGP.selection import TournamentSelection
 
 
@@ -56,3 +58,31 @@ def test_selection_of_middle_individual(mocker):
     mocker.patch("LGP.selection.random.random", side_effect=random_seq)
 
     assert tournament.select(population_fitness) == tournamentSize - len(random_seq)
+
+
+@pytest.mark.parametrize(("pTour", "expected"), ((1, 4), (0, 0)))
+def test_select_many_extremes(mocker, pTour, expected):
+    tournamentSize = 5
+    tournament = TournamentSelection(pTour, tournamentSize)
+
+    mocker.patch("LGP.selection.np.random.randint", return_value=np.array([[3, 0, 4, 1, 2]] * 10))
+
+    assert list(tournament.select_many(list(range(tournamentSize)), 10)) == [expected] * 10
+
+
+@pytest.mark.parametrize(("pTour", "size"), ((0.8, 4), (0.5, 2), (0.3, 3), (0.7, 1)))
+def test_select_many_distribution(pTour, size):
+    """
+    The batched selection should select with the same probabilities as select
+    """
+    n = 20_000
+    population_size = 6
+    fitness = [5.0, 1.0, 3.0, 0.0, 4.0, 2.0]
+    tournament = TournamentSelection(pTour, size)
+
+    random.seed(0)
+    np.random.seed(0)
+    single = np.bincount([tournament.select(fitness) for _ in range(n)], minlength=population_size) / n
+    many = np.bincount(tournament.select_many(fitness, n), minlength=population_size) / n
+
+    np.testing.assert_allclose(many, single, atol=0.02)